@@ -3,14 +3,14 @@ Stock Dashboard — Market Overview (Home)
 Streamlit multipage entry point.
 """
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 import _nav
 from db import (
-    SYMBOL_CATEGORY, SYMBOL_NAMES,
-    compute_overall_signal, detect_signals, load_overview_data,
-    signal_badge_html,
+    SYMBOL_TABLE,
+    compute_overall_signal_batch, detect_signals_batch, load_overview_data,
 )
 
 st.set_page_config(
@@ -26,7 +26,9 @@ _nav.inject()
 with st.sidebar:
     _nav.section("컨트롤")
     if st.button("↺  새로고침", use_container_width=True):
-        st.cache_data.clear()
+        # Scoped invalidation — a global clear() would also cold-start the
+        # other pages' loaders.
+        load_overview_data.clear()
         st.rerun()
     st.divider()
     _nav.status_bar("Yahoo Finance · 실시간 수집")
@@ -41,37 +43,85 @@ if df.empty:
     st.stop()
 
 # ── Compute signals & build display DataFrame ─────────────────────────────────
-records = []
-for _, row in df.iterrows():
-    sym = row["symbol"]
-    signals = detect_signals(row)
-    overall, score = compute_overall_signal(signals)
-
-    rsi_val = row.get("rsi_14")
-    records.append({
-        "종목":       sym,
-        "회사명":      SYMBOL_NAMES.get(sym, sym),
-        "분류":       SYMBOL_CATEGORY.get(sym, "?"),
-        "현재가":      row.get("price"),
-        "1일(%)":     row.get("ret_1d"),
-        "1주(%)":     row.get("ret_1w"),
-        "1개월(%)":   row.get("ret_1m"),
-        "1년(%)":     row.get("ret_1y"),
-        "RSI":        round(rsi_val, 1) if pd.notna(rsi_val) else None,
+_SIGNAL_EMOJI = {
+    "강력매수": "🟢 강력매수",
+    "매수":    "🟢 매수",
+    "중립":    "⚪ 중립",
+    "매도":    "🔴 매도",
+    "강력매도": "🔴 강력매도",
+}
+
+
+@st.cache_data(ttl=60)
+def build_display_df(df: pd.DataFrame) -> pd.DataFrame:
+    signals = detect_signals_batch(df)
+    overall, score = compute_overall_signal_batch(signals)
+
+    symbols = df["symbol"]
+    # Single positional gather over the fused lookup table instead of two
+    # per-row dict .map passes.
+    meta = SYMBOL_TABLE.reindex(symbols.to_numpy())
+    category = np.asarray(meta["category"].fillna("?"))
+    # Column-wise ndarray views with copy=False — no per-row Python objects
+    # and no defensive copy of the numeric blocks.
+    out = pd.DataFrame({
+        "종목":       symbols.to_numpy(),
+        "회사명":      np.where(meta["name"].notna(), meta["name"], symbols),
+        "분류":       category,
+        "현재가":      df["price"].to_numpy(),
+        "1일(%)":     df["ret_1d"].to_numpy(),
+        "1주(%)":     df["ret_1w"].to_numpy(),
+        "1개월(%)":   df["ret_1m"].to_numpy(),
+        "1년(%)":     df["ret_1y"].to_numpy(),
+        "RSI":        df["rsi_14"].round(1).to_numpy(),
         "신호":        overall,
         "_score":     score,
-        "_category":  SYMBOL_CATEGORY.get(sym, "?"),
-    })
+        "_category":  category,
+    }, copy=False)
 
-display_df = pd.DataFrame(records)
+    # Tiny fixed value sets — categorical codes make the downstream isin/==
+    # filters and the per-category groupby integer comparisons.
+    out["신호"] = pd.Categorical(
+        overall, categories=["강력매도", "매도", "중립", "매수", "강력매수"], ordered=True
+    )
+    out["_category"] = pd.Categorical(category, categories=["US", "KR", "ADR", "?"])
+
+    # Pre-formatted display strings — built once here (cached). The price
+    # keeps its <10,000 / ≥10,000 formatting split, which NumberColumn's
+    # printf format cannot express.
+    price = out["현재가"]
+    out["현재가_str"] = np.where(
+        price.isna(), "—",
+        np.where(price < 10000,
+                 price.map("{:,.2f}".format),
+                 price.map("{:,.0f}".format)),
+    )
+    out["1일(%)_str"] = np.where(out["1일(%)"].isna(), "—", out["1일(%)"].map("{:+.2f}%".format))
+    out["신호_str"]   = out["신호"].map(_SIGNAL_EMOJI)
+    return out
+
+
+# Cheap content fingerprint — when the data is unchanged within this session,
+# reuse the built frame from session_state and skip even cache_data's
+# full-DataFrame hash walk of `df`.
+_sig = (len(df), float(df["price"].sum()), df["symbol"].iloc[-1])
+if st.session_state.get("_overview_sig") == _sig:
+    display_df = st.session_state["_overview_display"]
+else:
+    display_df = build_display_df(df)
+    st.session_state["_overview_sig"] = _sig
+    st.session_state["_overview_display"] = display_df
 
 # ── Summary metrics ──────────────────────────────────────────────────────────
 col_a, col_b, col_c, col_d = st.columns(4)
 
-up_today   = display_df["1일(%)"].dropna().gt(0).sum()
-down_today = display_df["1일(%)"].dropna().lt(0).sum()
-buy_sigs   = display_df["신호"].isin(["매수", "강력매수"]).sum()
-sell_sigs  = display_df["신호"].isin(["매도", "강력매도"]).sum()
+# Raw ndarray comparisons — NaNs compare False, so no dropna copies needed.
+d = display_df["1일(%)"].to_numpy(dtype="float64")
+s = display_df["신호"].to_numpy()
+up_today   = int((d > 0).sum())
+down_today = int((d < 0).sum())
+buy_sigs   = int(((s == "매수") | (s == "강력매수")).sum())
+sell_sigs  = int(((s == "매도") | (s == "강력매도")).sum())
 
 col_a.metric("📈 상승 종목",  f"{up_today}개")
 col_b.metric("📉 하락 종목",  f"{down_today}개")
@@ -81,106 +131,124 @@ col_d.metric("🔴 매도 신호",  f"{sell_sigs}개")
 st.divider()
 
 
-# ── Helper: styled dataframe per category ─────────────────────────────────────
-def _pct_color(val):
-    if pd.isna(val):
-        return ""
-    return "color: #26a69a" if val > 0 else "color: #ef5350" if val < 0 else ""
+# ── Helper: native dataframe per category ─────────────────────────────────────
+_PCT_COLS = ["1일(%)", "1주(%)", "1개월(%)", "1년(%)"]
 
-
-def _signal_color(val):
-    mapping = {
-        "강력매수": "color: #a5d6a7; font-weight: bold",
-        "매수":    "color: #c8e6c9",
-        "중립":    "color: #b0bec5",
-        "매도":    "color: #ffcdd2",
-        "강력매도": "color: #ef9a9a; font-weight: bold",
-    }
-    return mapping.get(val, "")
+# Client-side formatting via Arrow + column_config — no pandas Styler, no
+# per-cell HTML payload over the websocket.
+_PCT_COL_CONFIG = st.column_config.NumberColumn(format="%+.2f%%")
+_TABLE_CONFIG = {
+    "현재가_str": st.column_config.TextColumn("현재가"),
+    "1일(%)":    _PCT_COL_CONFIG,
+    "1주(%)":    _PCT_COL_CONFIG,
+    "1개월(%)":  _PCT_COL_CONFIG,
+    "1년(%)":    _PCT_COL_CONFIG,
+    "RSI":       st.column_config.NumberColumn(format="%.1f"),
+    "신호_str":   st.column_config.TextColumn("신호"),
+}
+_TABLE_ORDER = ["종목", "회사명", "현재가_str", *_PCT_COLS, "RSI", "신호_str"]
 
 
 def render_table(df_subset: pd.DataFrame):
-    cols = ["종목", "회사명", "현재가", "1일(%)", "1주(%)", "1개월(%)", "1년(%)", "RSI", "신호"]
-    sub = df_subset[cols].copy()
-
-    def fmt_price(v):
-        if pd.isna(v): return "—"
-        return f"{v:,.2f}" if v < 10000 else f"{v:,.0f}"
-
-    sub["현재가"] = sub["현재가"].apply(fmt_price)
-
-    styled = (
-        sub.style
-        .map(_pct_color,    subset=["1일(%)", "1주(%)", "1개월(%)", "1년(%)"])
-        .map(_signal_color, subset=["신호"])
-        .format({
-            "1일(%)":   lambda v: f"{v:+.2f}%" if pd.notna(v) else "—",
-            "1주(%)":   lambda v: f"{v:+.2f}%" if pd.notna(v) else "—",
-            "1개월(%)": lambda v: f"{v:+.2f}%" if pd.notna(v) else "—",
-            "1년(%)":   lambda v: f"{v:+.2f}%" if pd.notna(v) else "—",
-            "RSI":      lambda v: f"{v:.1f}"   if pd.notna(v) else "—",
-        })
-        .set_properties(**{"text-align": "right"})
-        .set_properties(subset=["종목", "회사명", "신호"], **{"text-align": "left"})
+    st.dataframe(
+        df_subset,
+        column_order=_TABLE_ORDER,
+        column_config=_TABLE_CONFIG,
+        use_container_width=True,
+        hide_index=True,
     )
-    st.dataframe(styled, use_container_width=True, hide_index=True)
 
 
 # ── Category tabs ─────────────────────────────────────────────────────────────
-tab_all, tab_us, tab_kr, tab_adr = st.tabs(["전체", "🇺🇸 US", "🇰🇷 KR", "🌐 ADR"])
+@st.fragment
+def render_category_tabs(display_df: pd.DataFrame):
+    tab_all, tab_us, tab_kr, tab_adr = st.tabs(["전체", "🇺🇸 US", "🇰🇷 KR", "🌐 ADR"])
+
+    # One groupby pass instead of re-scanning display_df per tab.
+    by_cat = dict(tuple(display_df.groupby("_category", sort=False, observed=True)))
+    _empty = display_df.iloc[:0]
 
-with tab_all:
-    render_table(display_df)
+    with tab_all:
+        render_table(display_df)
 
-with tab_us:
-    render_table(display_df[display_df["_category"] == "US"])
+    with tab_us:
+        render_table(by_cat.get("US", _empty))
 
-with tab_kr:
-    render_table(display_df[display_df["_category"] == "KR"])
+    with tab_kr:
+        render_table(by_cat.get("KR", _empty))
+
+    with tab_adr:
+        render_table(by_cat.get("ADR", _empty))
 
-with tab_adr:
-    render_table(display_df[display_df["_category"] == "ADR"])
 
 # ── Top movers ────────────────────────────────────────────────────────────────
-st.divider()
-st.subheader("오늘의 주요 움직임")
-valid = display_df.dropna(subset=["1일(%)"])
-if not valid.empty:
-    top_gainers = valid.nlargest(3, "1일(%)")
-    top_losers  = valid.nsmallest(3, "1일(%)")
-
-    g_cols = st.columns(3)
-    for i, (_, row) in enumerate(top_gainers.iterrows()):
-        with g_cols[i]:
-            pct = row["1일(%)"]
-            st.metric(
-                label=f"🟢 {row['종목']} — {row['회사명']}",
-                value=f"{row['현재가']:,.2f}" if pd.notna(row['현재가']) else "—",
-                delta=f"{pct:+.2f}%",
-            )
-
-    l_cols = st.columns(3)
-    for i, (_, row) in enumerate(top_losers.iterrows()):
-        with l_cols[i]:
-            pct = row["1일(%)"]
-            st.metric(
-                label=f"🔴 {row['종목']} — {row['회사명']}",
-                value=f"{row['현재가']:,.2f}" if pd.notna(row['현재가']) else "—",
-                delta=f"{pct:+.2f}%",
-            )
+@st.fragment
+def render_top_movers(display_df: pd.DataFrame):
+    st.subheader("오늘의 주요 움직임")
+    vals = display_df["1일(%)"].to_numpy(dtype="float64")
+    idx  = np.flatnonzero(~np.isnan(vals))
+    if idx.size == 0:
+        return
+
+    # argpartition is O(N) vs a full sort, and skips the dropna copy.
+    k = min(3, idx.size)
+    if idx.size > k:
+        top = idx[np.argpartition(-vals[idx], k - 1)[:k]]
+        bot = idx[np.argpartition(vals[idx],  k - 1)[:k]]
+    else:
+        top = bot = idx
+    top = top[np.argsort(-vals[top])]
+    bot = bot[np.argsort(vals[bot])]
+
+    top_gainers = display_df.iloc[top]
+    top_losers  = display_df.iloc[bot]
+
+    # One markdown element instead of six st.metric widgets (and their
+    # individual websocket deltas / DOM nodes).
+    def _card(row, icon: str, color: str) -> str:
+        return (
+            '<div style="flex:1;min-width:180px;border:1px solid #1e2d45;'
+            'border-radius:8px;padding:12px">'
+            f'<div style="font-size:0.8em;color:#9e9e9e">{icon} {row["종목"]} — {row["회사명"]}</div>'
+            f'<div style="font-size:1.35em;font-weight:bold">{row["현재가_str"]}</div>'
+            f'<div style="color:{color};font-size:0.9em">{row["1일(%)_str"]}</div>'
+            "</div>"
+        )
+
+    g_cards = "".join(_card(r, "🟢", "#26a69a") for _, r in top_gainers.iterrows())
+    l_cards = "".join(_card(r, "🔴", "#ef5350") for _, r in top_losers.iterrows())
+    st.markdown(
+        f'<div style="display:flex;gap:12px;flex-wrap:wrap;margin-bottom:12px">{g_cards}</div>'
+        f'<div style="display:flex;gap:12px;flex-wrap:wrap">{l_cards}</div>',
+        unsafe_allow_html=True,
+    )
+
 
 # ── Signal leaderboard ────────────────────────────────────────────────────────
+@st.fragment
+def render_leaderboard(display_df: pd.DataFrame):
+    st.subheader("신호 강도 순위")
+    # Sort permutation on the raw scores — one .iloc copy instead of the
+    # copy / sort_values / drop chain.
+    scores = display_df["_score"].to_numpy(dtype="float64")
+    order = np.argsort(-scores, kind="stable")
+    ranked = display_df.iloc[order][["종목", "회사명", "현재가_str", "신호_str"]]
+    ranked = ranked.assign(점수=scores[order].round(2))
+
+    st.dataframe(
+        ranked,
+        column_config={
+            "현재가_str": st.column_config.TextColumn("현재가"),
+            "신호_str":   st.column_config.TextColumn("신호"),
+            "점수":       st.column_config.NumberColumn(format="%.2f"),
+        },
+        use_container_width=True,
+        hide_index=True,
+    )
+
+
+render_category_tabs(display_df)
 st.divider()
-st.subheader("신호 강도 순위")
-ranked = display_df[["종목", "회사명", "현재가", "신호", "_score"]].copy()
-ranked["점수"] = ranked["_score"].round(2)
-ranked = ranked.sort_values("점수", ascending=False)
-ranked = ranked.drop(columns=["_score"])
-
-st.dataframe(
-    ranked.style
-    .map(_signal_color, subset=["신호"])
-    .format({"현재가": lambda v: f"{v:,.2f}" if pd.notna(v) else "—"}),
-    use_container_width=True,
-    hide_index=True,
-)
+render_top_movers(display_df)
+st.divider()
+render_leaderboard(display_df)
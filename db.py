@@ -4,12 +4,14 @@ Imported by app.py and all pages/*.py files.
 """
 
 import os
+import threading
+from datetime import date
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 import streamlit as st
-from plotly.subplots import make_subplots
-from sqlalchemy import create_engine, text
+from sqlalchemy import ARRAY, String, bindparam, create_engine, text
 
 # ── Symbol metadata ─────────────────────────────────────────────────────────
 
@@ -97,28 +99,126 @@ KR_SYMBOLS  = [s for s, c in SYMBOL_CATEGORY.items() if c == "KR"]
 ADR_SYMBOLS = [s for s, c in SYMBOL_CATEGORY.items() if c == "ADR"]
 ALL_SYMBOLS = US_SYMBOLS + KR_SYMBOLS + ADR_SYMBOLS
 
+# Fused name/category lookup, indexed by symbol — one reindex/join gather per
+# frame instead of a Python dict hash per row via .map/.get.
+SYMBOL_TABLE = pd.DataFrame(
+    {
+        "name": pd.Series(SYMBOL_NAMES),
+        "category": pd.Categorical(
+            [SYMBOL_CATEGORY.get(s, "?") for s in SYMBOL_NAMES],
+            categories=["US", "KR", "ADR", "?"],
+        ),
+    },
+    index=pd.Index(SYMBOL_NAMES, name="symbol"),
+)
+
+# Precomputed "SYM — Name" option labels for select widgets — the per-option
+# format_func lambdas re-ran an f-string + dict.get on every rerun.
+SYMBOL_DISPLAY = {s: f"{s} — {n}" for s, n in SYMBOL_NAMES.items()}
+
 TIMEFRAME_DAYS = {
     "1W": 7, "1M": 30, "3M": 90, "6M": 180,
     "1Y": 365, "2Y": 730, "3Y": 1095,
 }
 
+# ── Optional Redis cache tier ─────────────────────────────────────────────────
+# st.cache_data is per-process; on multi-replica deployments every replica
+# re-runs each query on its first hit. Setting REDIS_URL (with the redis
+# package installed) adds a shared tier keyed by query + today's date, so one
+# replica's fetch serves them all. Without it, nothing changes.
+
+try:
+    import redis as _redis
+except ImportError:
+    _redis = None
+
+_REDIS = None
+if _redis is not None and os.environ.get("REDIS_URL"):
+    try:
+        _REDIS = _redis.Redis.from_url(os.environ["REDIS_URL"], decode_responses=False)
+    except Exception:
+        _REDIS = None
+
+
+def _cache_get_df(key: str) -> pd.DataFrame | None:
+    """Fetch a DataFrame from the shared tier (None on miss/any failure)."""
+    if _REDIS is None:
+        return None
+    try:
+        blob = _REDIS.get(key)
+    except Exception:
+        return None
+    if not blob:
+        return None
+    import pyarrow as pa
+    return pa.ipc.open_stream(blob).read_pandas()
+
+
+def _cache_set_df(key: str, df: pd.DataFrame, ttl: int = 300) -> None:
+    """Store a DataFrame in the shared tier as an Arrow IPC stream (~3× smaller
+    than pickle). Failures are swallowed — the tier is best-effort."""
+    if _REDIS is None:
+        return
+    import pyarrow as pa
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    buf = pa.BufferOutputStream()
+    with pa.ipc.new_stream(buf, table.schema) as writer:
+        writer.write_table(table)
+    try:
+        _REDIS.setex(key, ttl, buf.getvalue().to_pybytes())
+    except Exception:
+        pass
+
+
 # ── DB helpers ───────────────────────────────────────────────────────────────
 
+# Every numeric column the queries in this module can return. _df coerces by
+# name instead of dtype-sniffing each object column with the deprecated
+# pd.to_numeric(errors="ignore") probe.
+_NUMERIC_COLS = frozenset({
+    "open", "high", "low", "close",
+    "sma_20", "sma_50", "sma_200",
+    "bb_upper", "bb_middle", "bb_lower",
+    "rsi_14", "macd", "macd_signal", "macd_hist",
+    "cci_20", "atr_14", "mfi_14",
+    "price", "ret_1d", "ret_1w", "ret_1m", "ret_1y",
+    "pe_ratio", "pb_ratio", "roe", "eps", "dividend_yield",
+    "value",
+})
+_BIGINT_COLS = frozenset({"volume", "obv", "market_cap"})
+
+
 def _df(result) -> pd.DataFrame:
     """Build DataFrame from a SQLAlchemy CursorResult.
 
-    psycopg2 returns PostgreSQL NUMERIC as Python Decimal — convert all
-    numeric-looking object columns to float64 so Plotly & pandas work correctly.
+    The psycopg2 casters already decode NUMERIC/DATE to float/datetime64, so
+    the name-keyed coercion below only fires on object columns (e.g. all-NULL
+    results) and never probes known-string columns like title/url/sector.
     """
     df = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
     for col in df.columns:
-        if df[col].dtype == object:
-            converted = pd.to_numeric(df[col], errors="ignore")
-            if converted.dtype != object:        # conversion succeeded
-                df[col] = converted
+        if df[col].dtype == object and (col in _NUMERIC_COLS or col in _BIGINT_COLS):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
     return df
 
 
+def _compact_price_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Re-back a price frame with pyarrow dtypes, numerics downcast to float32.
+
+    A 3Y frame is ~20 float64 columns; Arrow storage with float32 roughly
+    halves its resident size and replaces NaN sentinels with validity
+    bitmaps. float32 is plenty for display/charting, volume/obv stay int64.
+    detect_signals and the chart builders consume the result unchanged —
+    to_numpy() on the Arrow columns yields plain float32 arrays.
+    """
+    if df.empty:
+        return df
+    df = df.convert_dtypes(dtype_backend="pyarrow")
+    f32 = {c: "float32[pyarrow]" for c in df.columns
+           if c in _NUMERIC_COLS and c not in _BIGINT_COLS}
+    return df.astype(f32) if f32 else df
+
+
 # ── DB connection ─────────────────────────────────────────────────────────────
 
 _DDL = """
@@ -126,25 +226,25 @@ CREATE TABLE IF NOT EXISTS stock_prices (
     id          SERIAL PRIMARY KEY,
     symbol      VARCHAR(20)  NOT NULL,
     trade_date  DATE         NOT NULL,
-    open        NUMERIC(12,4),
-    high        NUMERIC(12,4),
-    low         NUMERIC(12,4),
-    close       NUMERIC(12,4),
+    open        DOUBLE PRECISION,
+    high        DOUBLE PRECISION,
+    low         DOUBLE PRECISION,
+    close       DOUBLE PRECISION,
     volume      BIGINT,
-    sma_20      NUMERIC(12,4),
-    sma_50      NUMERIC(12,4),
-    sma_200     NUMERIC(12,4),
-    bb_upper    NUMERIC(12,4),
-    bb_middle   NUMERIC(12,4),
-    bb_lower    NUMERIC(12,4),
-    rsi_14      NUMERIC(8,4),
-    macd        NUMERIC(12,6),
-    macd_signal NUMERIC(12,6),
-    macd_hist   NUMERIC(12,6),
-    cci_20      NUMERIC(12,4),
-    atr_14      NUMERIC(12,4),
+    sma_20      DOUBLE PRECISION,
+    sma_50      DOUBLE PRECISION,
+    sma_200     DOUBLE PRECISION,
+    bb_upper    DOUBLE PRECISION,
+    bb_middle   DOUBLE PRECISION,
+    bb_lower    DOUBLE PRECISION,
+    rsi_14      DOUBLE PRECISION,
+    macd        DOUBLE PRECISION,
+    macd_signal DOUBLE PRECISION,
+    macd_hist   DOUBLE PRECISION,
+    cci_20      DOUBLE PRECISION,
+    atr_14      DOUBLE PRECISION,
     obv         BIGINT,
-    mfi_14      NUMERIC(8,4),
+    mfi_14      DOUBLE PRECISION,
     created_at  TIMESTAMP DEFAULT NOW(),
     updated_at  TIMESTAMP DEFAULT NOW(),
     UNIQUE (symbol, trade_date)
@@ -223,9 +323,75 @@ CREATE INDEX IF NOT EXISTS idx_digest_week_start ON weekly_digest (week_start DE
 """
 
 
+def _register_pg_casters() -> None:
+    """Decode PostgreSQL NUMERIC straight to float in psycopg2's C layer.
+
+    Skips the per-cell decimal.Decimal allocation that _df() then has to undo
+    column-by-column with pd.to_numeric — for a 3Y prices query that's ~22k
+    Decimal objects avoided per load.
+    """
+    import psycopg2.extensions as _ext
+
+    dec2float = _ext.new_type(
+        _ext.DECIMAL.values, "DEC2FLOAT",
+        lambda value, cursor: float(value) if value is not None else None,
+    )
+    _ext.register_type(dec2float)
+
+    # DATE → np.datetime64 so DataFrame construction infers datetime64[ns]
+    # directly; no pd.to_datetime reparse pass per loader. (NULLs never reach
+    # the caster — psycopg2 returns None for them, which pandas maps to NaT.)
+    date2np = _ext.new_type(
+        _ext.DATE.values, "DATE2NPDATE",
+        lambda value, cursor: np.datetime64(value, "D") if value is not None else None,
+    )
+    _ext.register_type(date2np)
+
+
+# Price/indicator columns migrated NUMERIC → float8. All consumers (pandas,
+# plotly, talib) work in float64 anyway; float8 skips the variable-width
+# NUMERIC wire decode and the per-cell Decimal allocation on every read.
+_FLOAT8_COLUMNS = (
+    "open", "high", "low", "close",
+    "sma_20", "sma_50", "sma_200",
+    "bb_upper", "bb_middle", "bb_lower",
+    "rsi_14", "macd", "macd_signal", "macd_hist",
+    "cci_20", "atr_14", "mfi_14",
+)
+
+
+def _apply_migrations(conn) -> None:
+    """In-place upgrades for databases created by earlier schema versions.
+
+    Runs on every start (unlike the table DDL, which is skipped once
+    stock_prices exists), so each step must be cheap to re-check."""
+    numeric_close = conn.exec_driver_sql(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name='stock_prices' AND column_name='close' "
+        "  AND data_type='numeric'"
+    ).fetchone()
+    if numeric_close:
+        alters = ", ".join(
+            f"ALTER COLUMN {col} TYPE DOUBLE PRECISION USING {col}::float8"
+            for col in _FLOAT8_COLUMNS
+        )
+        conn.exec_driver_sql(f"ALTER TABLE stock_prices {alters}")
+
+    # Covering index: the overview scan and per-symbol price loads become
+    # index-only (no heap fetches on the hot table).
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS idx_sp_symbol_date_covering "
+        "ON stock_prices (symbol, trade_date DESC) "
+        "INCLUDE (open, high, low, close, volume, sma_20, sma_50, sma_200, "
+        "bb_upper, bb_middle, bb_lower, rsi_14, macd, macd_signal, macd_hist, "
+        "cci_20, atr_14, obv, mfi_14)"
+    )
+
+
 def _ensure_schema(engine) -> None:
     """Create all tables if they don't exist yet (idempotent).
-    Checks table existence first — skips DDL on subsequent starts."""
+    Checks table existence first — skips table DDL on subsequent starts,
+    then applies in-place migrations."""
     with engine.begin() as conn:
         exists = conn.exec_driver_sql(
             "SELECT 1 FROM pg_tables "
@@ -233,10 +399,23 @@ def _ensure_schema(engine) -> None:
         ).fetchone()
         if not exists:
             conn.exec_driver_sql(_DDL)
+        _apply_migrations(conn)
+
+
+# One pool per process, shared with non-Streamlit callers (batch scripts that
+# import db.py directly). @st.cache_resource alone would create a second pool
+# for them. NB: on hosts with a low Postgres max_connections ceiling
+# (e.g. Streamlit Cloud), drop pool_size to ~5.
+_ENGINE = None
+_ENGINE_LOCK = threading.Lock()
 
 
 @st.cache_resource
 def get_engine():
+    global _ENGINE
+    if _ENGINE is not None:
+        return _ENGINE
+
     # Priority: st.secrets (Streamlit Cloud) → env var (local Docker)
     conn_str = None
     try:
@@ -252,159 +431,286 @@ def get_engine():
             "```toml\nDATA_DB_CONN = \"postgresql://...\"\n```"
         )
         st.stop()
-    engine = create_engine(
-        conn_str,
-        pool_pre_ping=True,
-        pool_size=2,
-        max_overflow=3,
-    )
-    _ensure_schema(engine)
-    return engine
 
-
-@st.cache_data(ttl=300)
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            _register_pg_casters()
+            engine = create_engine(
+                conn_str,
+                pool_pre_ping=True,
+                pool_size=10,        # 5 pages × ≥4 queries — 2/3 serialized on acquisition
+                max_overflow=20,
+                pool_recycle=3600,
+                pool_use_lifo=True,  # reuse hot connections, let idle ones age out
+                # Explicit compiled-statement cache (server-side prepared
+                # statements need psycopg ≥ 3; psycopg2 has no
+                # prepare_threshold). Effective once the text() clauses are
+                # module-level constants with stable cache keys.
+                query_cache_size=500,
+            )
+            _ensure_schema(engine)
+            _ENGINE = engine
+    return _ENGINE
+
+
+# ── Queries ────────────────────────────────────────────────────────────────────
+# text() clauses hoisted to module scope: SQLAlchemy's compiled-statement
+# cache keys on the TextClause object, so a fresh one per call would defeat
+# the cache that query_cache_size sizes above.
+
+_Q_SYMBOLS = text("SELECT DISTINCT symbol FROM stock_prices ORDER BY symbol")
+
+_Q_PRICES = text("""
+    SELECT trade_date, open, high, low, close, volume,
+           sma_20, sma_50, sma_200,
+           bb_upper, bb_middle, bb_lower,
+           rsi_14, macd, macd_signal, macd_hist,
+           cci_20, atr_14, mfi_14, obv
+    FROM stock_prices
+    WHERE symbol = :symbol
+      AND trade_date >= CURRENT_DATE - :days * INTERVAL '1 day'
+    ORDER BY trade_date
+""")
+
+_Q_FUNDAMENTALS = text("""
+    SELECT * FROM stock_fundamentals
+    WHERE symbol = :symbol
+    ORDER BY fetch_date DESC
+    LIMIT 1
+""")
+
+_Q_FUNDAMENTALS_ALL = text("""
+    SELECT DISTINCT ON (symbol) *
+    FROM stock_fundamentals
+    ORDER BY symbol, fetch_date DESC
+""")
+
+_Q_NEWS_BY_SYMBOLS = text("""
+    SELECT title, source, published, url, summary, symbol,
+           ai_summary, sentiment
+    FROM stock_news
+    WHERE symbol = ANY(:syms)
+    ORDER BY published DESC NULLS LAST
+    LIMIT :limit
+""").bindparams(bindparam("syms", type_=ARRAY(String)))
+
+_Q_NEWS_ALL = text("""
+    SELECT title, source, published, url, summary, symbol,
+           ai_summary, sentiment
+    FROM stock_news
+    ORDER BY published DESC NULLS LAST
+    LIMIT :limit
+""")
+
+_Q_MULTI_PRICES = text("""
+    SELECT symbol, trade_date, close
+    FROM stock_prices
+    WHERE symbol = ANY(:syms)
+      AND trade_date >= CURRENT_DATE - :days * INTERVAL '1 day'
+    ORDER BY symbol, trade_date
+""").bindparams(bindparam("syms", type_=ARRAY(String)))
+
+_Q_ALL_PRICES = text("""
+    SELECT symbol, trade_date, open, high, low, close, volume,
+           sma_20, sma_50, sma_200,
+           bb_upper, bb_middle, bb_lower,
+           rsi_14, macd, macd_signal, macd_hist,
+           cci_20, atr_14, mfi_14, obv
+    FROM stock_prices
+    WHERE symbol = ANY(:syms)
+      AND trade_date >= CURRENT_DATE - :days * INTERVAL '1 day'
+    ORDER BY symbol, trade_date
+""").bindparams(bindparam("syms", type_=ARRAY(String)))
+
+_Q_MACRO_BY_KEYS = text("""
+    SELECT series_key, trade_date, value
+    FROM macro_indicators
+    WHERE series_key = ANY(:keys)
+      AND trade_date >= CURRENT_DATE - :days * INTERVAL '1 day'
+    ORDER BY trade_date
+""").bindparams(bindparam("keys", type_=ARRAY(String)))
+
+_Q_MACRO_ALL = text("""
+    SELECT series_key, trade_date, value
+    FROM macro_indicators
+    WHERE trade_date >= CURRENT_DATE - :days * INTERVAL '1 day'
+    ORDER BY trade_date
+""")
+
+_Q_WEEKLY_DIGESTS = text("""
+    SELECT week_start, week_end, headline, content, created_at
+    FROM weekly_digest
+    ORDER BY week_start DESC
+    LIMIT :limit
+""")
+
+_Q_OVERVIEW = text("""
+    WITH recent AS (
+        SELECT symbol, trade_date, close, rsi_14, macd, macd_signal,
+               sma_50, sma_200, bb_upper, bb_lower, bb_middle, mfi_14
+        FROM stock_prices
+        WHERE trade_date >= CURRENT_DATE - INTERVAL '400 days'
+    ), agg AS (
+        SELECT
+            symbol,
+            (array_agg(close       ORDER BY trade_date DESC))[1] AS price,
+            (array_agg(rsi_14      ORDER BY trade_date DESC))[1] AS rsi_14,
+            (array_agg(macd        ORDER BY trade_date DESC))[1] AS macd,
+            (array_agg(macd_signal ORDER BY trade_date DESC))[1] AS macd_signal,
+            (array_agg(sma_50      ORDER BY trade_date DESC))[1] AS sma_50,
+            (array_agg(sma_200     ORDER BY trade_date DESC))[1] AS sma_200,
+            (array_agg(bb_upper    ORDER BY trade_date DESC))[1] AS bb_upper,
+            (array_agg(bb_lower    ORDER BY trade_date DESC))[1] AS bb_lower,
+            (array_agg(bb_middle   ORDER BY trade_date DESC))[1] AS bb_middle,
+            (array_agg(mfi_14      ORDER BY trade_date DESC))[1] AS mfi_14,
+            (array_agg(close ORDER BY trade_date DESC)
+                FILTER (WHERE trade_date <= CURRENT_DATE - INTERVAL '1 day'))[1]    AS d1_close,
+            (array_agg(close ORDER BY trade_date DESC)
+                FILTER (WHERE trade_date <= CURRENT_DATE - INTERVAL '7 days'))[1]   AS d7_close,
+            (array_agg(close ORDER BY trade_date DESC)
+                FILTER (WHERE trade_date <= CURRENT_DATE - INTERVAL '30 days'))[1]  AS d30_close,
+            (array_agg(close ORDER BY trade_date DESC)
+                FILTER (WHERE trade_date <= CURRENT_DATE - INTERVAL '365 days'))[1] AS d365_close
+        FROM recent
+        GROUP BY symbol
+    )
+    SELECT
+        symbol, price, rsi_14, macd, macd_signal,
+        sma_50, sma_200, bb_upper, bb_lower, bb_middle, mfi_14,
+        ROUND(((price - d1_close)   / NULLIF(d1_close,   0) * 100)::numeric, 2) AS ret_1d,
+        ROUND(((price - d7_close)   / NULLIF(d7_close,   0) * 100)::numeric, 2) AS ret_1w,
+        ROUND(((price - d30_close)  / NULLIF(d30_close,  0) * 100)::numeric, 2) AS ret_1m,
+        ROUND(((price - d365_close) / NULLIF(d365_close, 0) * 100)::numeric, 2) AS ret_1y
+    FROM agg
+    ORDER BY symbol
+""")
+
+
+# persist="disk": symbol/fundamental/overview data only changes after a DAG
+# run, so surviving a server restart saves the first visitor the DB trip.
+@st.cache_data(ttl=300, persist="disk")
 def load_symbols() -> list[str]:
     with get_engine().connect() as conn:
-        rows = conn.execute(
-            text("SELECT DISTINCT symbol FROM stock_prices ORDER BY symbol")
-        ).fetchall()
+        rows = conn.execute(_Q_SYMBOLS).fetchall()
     return [r[0] for r in rows]
 
 
 @st.cache_data(ttl=300)
 def load_prices(symbol: str, days: int) -> pd.DataFrame:
+    key = f"prices:{symbol}:{days}:{date.today().isoformat()}"
+    cached = _cache_get_df(key)
+    if cached is not None:
+        # The IPC round trip keeps float32 but lands on the NumPy backend;
+        # re-back it so both paths hand out the same dtypes.
+        return _compact_price_frame(cached)
     with get_engine().connect() as conn:
-        result = conn.execute(
-            text("""
-                SELECT trade_date, open, high, low, close, volume,
-                       sma_20, sma_50, sma_200,
-                       bb_upper, bb_middle, bb_lower,
-                       rsi_14, macd, macd_signal, macd_hist,
-                       cci_20, atr_14, mfi_14, obv
-                FROM stock_prices
-                WHERE symbol = :symbol
-                  AND trade_date >= CURRENT_DATE - :days * INTERVAL '1 day'
-                ORDER BY trade_date
-            """),
-            {"symbol": symbol, "days": days},
-        )
-        df = _df(result)
-    df["trade_date"] = pd.to_datetime(df["trade_date"])
+        df = _compact_price_frame(_df(conn.execute(_Q_PRICES, {"symbol": symbol, "days": days})))
+    _cache_set_df(key, df)
     return df
 
 
-@st.cache_data(ttl=300)
+@st.cache_data(ttl=300, persist="disk")
 def load_overview_data() -> pd.DataFrame:
-    """Single query: latest price + 1D/1W/1M/1Y returns + key indicators for all symbols."""
-    with get_engine().connect() as conn:
-        result = conn.execute(text("""
-            SELECT
-                l.symbol,
-                l.close                                                                 AS price,
-                l.rsi_14, l.macd, l.macd_signal,
-                l.sma_50, l.sma_200,
-                l.bb_upper, l.bb_lower, l.bb_middle,
-                l.mfi_14,
-                ROUND((l.close - d1.close)   / NULLIF(d1.close,   0) * 100, 2)        AS ret_1d,
-                ROUND((l.close - d7.close)   / NULLIF(d7.close,   0) * 100, 2)        AS ret_1w,
-                ROUND((l.close - d30.close)  / NULLIF(d30.close,  0) * 100, 2)        AS ret_1m,
-                ROUND((l.close - d365.close) / NULLIF(d365.close, 0) * 100, 2)        AS ret_1y
-            FROM (
-                SELECT DISTINCT ON (symbol)
-                    symbol, close, rsi_14, macd, macd_signal,
-                    sma_50, sma_200, bb_upper, bb_lower, bb_middle, mfi_14
-                FROM stock_prices
-                ORDER BY symbol, trade_date DESC
-            ) l
-            LEFT JOIN LATERAL (
-                SELECT close FROM stock_prices
-                WHERE symbol = l.symbol AND trade_date <= CURRENT_DATE - INTERVAL '1 day'
-                ORDER BY trade_date DESC LIMIT 1
-            ) d1 ON true
-            LEFT JOIN LATERAL (
-                SELECT close FROM stock_prices
-                WHERE symbol = l.symbol AND trade_date <= CURRENT_DATE - INTERVAL '7 days'
-                ORDER BY trade_date DESC LIMIT 1
-            ) d7 ON true
-            LEFT JOIN LATERAL (
-                SELECT close FROM stock_prices
-                WHERE symbol = l.symbol AND trade_date <= CURRENT_DATE - INTERVAL '30 days'
-                ORDER BY trade_date DESC LIMIT 1
-            ) d30 ON true
-            LEFT JOIN LATERAL (
-                SELECT close FROM stock_prices
-                WHERE symbol = l.symbol AND trade_date <= CURRENT_DATE - INTERVAL '365 days'
-                ORDER BY trade_date DESC LIMIT 1
-            ) d365 ON true
-            ORDER BY l.symbol
-        """))
-        return _df(result)
+    """Single query: latest price + 1D/1W/1M/1Y returns + key indicators for all symbols.
 
+    One index range scan per symbol over the last ~400 days — the latest row
+    and each return anchor fall out of ordered array_agg/FILTER aggregates,
+    replacing the old DISTINCT ON + four LATERAL probes (5 scans per symbol).
+    """
+    key = f"overview:{date.today().isoformat()}"
+    cached = _cache_get_df(key)
+    if cached is not None:
+        return cached
+    # Server-side cursor: rows stream over in small buffers instead of the
+    # driver materializing the whole result (one row per symbol today, but
+    # this query grows linearly with the symbol universe).
+    with get_engine().connect().execution_options(
+        stream_results=True, max_row_buffer=100
+    ) as conn:
+        df = _df(conn.execute(_Q_OVERVIEW))
+    _cache_set_df(key, df)
+    return df
 
-@st.cache_data(ttl=3600)
+
+@st.cache_data(ttl=3600, persist="disk")
 def load_fundamentals(symbol: str) -> pd.DataFrame:
     with get_engine().connect() as conn:
-        result = conn.execute(
-            text("""
-                SELECT * FROM stock_fundamentals
-                WHERE symbol = :symbol
-                ORDER BY fetch_date DESC
-                LIMIT 1
-            """),
-            {"symbol": symbol},
-        )
-        return _df(result)
+        return _df(conn.execute(_Q_FUNDAMENTALS, {"symbol": symbol}))
+
+
+@st.cache_data(ttl=3600, persist="disk")
+def load_fundamentals_all() -> pd.DataFrame:
+    """Latest fundamentals row per symbol, indexed by symbol — one
+    DISTINCT ON query for pages that compare several symbols."""
+    with get_engine().connect() as conn:
+        df = _df(conn.execute(_Q_FUNDAMENTALS_ALL))
+    return df.set_index("symbol") if not df.empty else df
+
+
+def _split_ai_summary(text_: str) -> tuple:
+    """Split an ai_summary blob into ((icon, header, body), ...) sections.
+
+    Done once when the frame is loaded (i.e. per cache fill) so the news
+    render loop only formats — it used to re-split every article on every
+    rerun, collapsed or not.
+    """
+    sections = []
+    for part in text_.split("\n\n"):
+        if part[:1] in ("📌", "💡", "📊"):
+            header, _, body = part.partition("\n")
+            sections.append((part[:1], header, body))
+        else:
+            sections.append(("", "", part))
+    return tuple(sections)
 
 
 @st.cache_data(ttl=300)
-def load_news(symbol: str = None, limit: int = 60) -> pd.DataFrame:
+def load_news(symbols: str | tuple[str, ...] | None = None, limit: int = 60) -> pd.DataFrame:
+    """News for one symbol, a tuple of symbols (single IN query), or all."""
+    if isinstance(symbols, str):
+        symbols = (symbols,)
     with get_engine().connect() as conn:
-        if symbol:
-            result = conn.execute(
-                text("""
-                    SELECT title, source, published, url, summary, symbol,
-                           ai_summary, sentiment
-                    FROM stock_news
-                    WHERE symbol = :symbol
-                    ORDER BY published DESC NULLS LAST
-                    LIMIT :limit
-                """),
-                {"symbol": symbol, "limit": limit},
-            )
+        if symbols:
+            result = conn.execute(_Q_NEWS_BY_SYMBOLS, {"syms": list(symbols), "limit": limit})
         else:
-            result = conn.execute(
-                text("""
-                    SELECT title, source, published, url, summary, symbol,
-                           ai_summary, sentiment
-                    FROM stock_news
-                    ORDER BY published DESC NULLS LAST
-                    LIMIT :limit
-                """),
-                {"limit": limit},
-            )
-        return _df(result)
+            result = conn.execute(_Q_NEWS_ALL, {"limit": limit})
+    df = _df(result)
+    if "published" in df.columns:
+        # Parse once per cache fill; pub_date feeds the feed's day grouping.
+        df["published"] = pd.to_datetime(df["published"], errors="coerce")
+        df["pub_date"] = df["published"].dt.normalize()
+    if "ai_summary" in df.columns:
+        df["ai_sections"] = [
+            _split_ai_summary(s) if isinstance(s, str) and s else None
+            for s in df["ai_summary"].to_numpy()
+        ]
+    return df
 
 
 @st.cache_data(ttl=300)
 def load_multi_prices(symbols: tuple, days: int) -> pd.DataFrame:
     """Load prices for multiple symbols — used by Comparison page."""
-    from sqlalchemy import ARRAY, String, bindparam
     with get_engine().connect() as conn:
-        result = conn.execute(
-            text("""
-                SELECT symbol, trade_date, close
-                FROM stock_prices
-                WHERE symbol = ANY(:syms)
-                  AND trade_date >= CURRENT_DATE - :days * INTERVAL '1 day'
-                ORDER BY symbol, trade_date
-            """).bindparams(
-                bindparam("syms", value=list(symbols), type_=ARRAY(String)),
-                bindparam("days", value=days),
-            ),
-        )
+        result = conn.execute(_Q_MULTI_PRICES, {"syms": list(symbols), "days": days})
         return _df(result)
 
 
+@st.cache_data(ttl=300)
+def load_all_prices(symbols: tuple, days: int) -> dict:
+    """Load full price history for many symbols in one round-trip.
+
+    Returns {symbol: DataFrame} — one ANY(:syms) query instead of N
+    load_prices round-trips, then split client-side by symbol.
+    """
+    with get_engine().connect() as conn:
+        result = conn.execute(_Q_ALL_PRICES, {"syms": list(symbols), "days": days})
+        df = _df(result)
+    return {
+        sym: g.drop(columns=["symbol"]).reset_index(drop=True)
+        for sym, g in df.groupby("symbol", sort=False)
+    }
+
+
 MACRO_LABELS = {
     "SP500": "S&P 500", "Nasdaq100": "Nasdaq 100", "DowJones": "Dow Jones",
     "KOSPI": "KOSPI", "KOSDAQ": "KOSDAQ",
@@ -419,52 +725,27 @@ MACRO_LABELS = {
 @st.cache_data(ttl=300)
 def load_macro_data(series_keys: list[str] | None = None, days: int = 365) -> pd.DataFrame:
     """Return macro indicators in wide format (date index, series as columns)."""
-    from sqlalchemy import ARRAY, String, bindparam
     with get_engine().connect() as conn:
         if series_keys:
-            result = conn.execute(
-                text("""
-                    SELECT series_key, trade_date, value
-                    FROM macro_indicators
-                    WHERE series_key = ANY(:keys)
-                      AND trade_date >= CURRENT_DATE - :days * INTERVAL '1 day'
-                    ORDER BY trade_date
-                """).bindparams(
-                    bindparam("keys", value=list(series_keys), type_=ARRAY(String)),
-                    bindparam("days", value=days),
-                ),
-            )
+            result = conn.execute(_Q_MACRO_BY_KEYS, {"keys": list(series_keys), "days": days})
         else:
-            result = conn.execute(
-                text("""
-                    SELECT series_key, trade_date, value
-                    FROM macro_indicators
-                    WHERE trade_date >= CURRENT_DATE - :days * INTERVAL '1 day'
-                    ORDER BY trade_date
-                """),
-                {"days": days},
-            )
+            result = conn.execute(_Q_MACRO_ALL, {"days": days})
         df = _df(result)
     if df.empty:
         return df
-    df["trade_date"] = pd.to_datetime(df["trade_date"])
     return df.pivot(index="trade_date", columns="series_key", values="value").sort_index()
 
 
-@st.cache_data(ttl=600)
+# Digests only change on the weekly DAG run — 15 minutes is still far
+# fresher than the data.
+@st.cache_data(ttl=900)
 def load_weekly_digests(limit: int = 12) -> pd.DataFrame:
     """Load recent weekly digests ordered newest first."""
     with get_engine().connect() as conn:
-        result = conn.execute(
-            text("""
-                SELECT week_start, week_end, headline, content, created_at
-                FROM weekly_digest
-                ORDER BY week_start DESC
-                LIMIT :limit
-            """),
-            {"limit": limit},
-        )
-        return _df(result)
+        df = _df(conn.execute(_Q_WEEKLY_DIGESTS, {"limit": limit}))
+    # Arrow-backed strings keep headline/content in contiguous buffers
+    # instead of one PyObject per cell. Missing values become pd.NA.
+    return df.convert_dtypes(dtype_backend="pyarrow")
 
 
 # ── Signal detection ─────────────────────────────────────────────────────────
@@ -487,11 +768,48 @@ SIGNAL_COLORS = {
 }
 
 
-def detect_signals(row: pd.Series, prev_row: pd.Series | None = None) -> dict:
+# Label codes for detect_signals — labels are formatted lazily by
+# format_signal for the rows actually rendered, instead of building every
+# f-string on every detection pass.
+LABEL_TEMPLATES = {
+    1:  "과매도 ({:.1f})",
+    2:  "매수 우위 ({:.1f})",
+    3:  "과매수 ({:.1f})",
+    4:  "매도 우위 ({:.1f})",
+    5:  "중립 ({:.1f})",
+    6:  "MACD 강세",
+    7:  "MACD 약세",
+    8:  "MACD 중립",
+    9:  "SMA200 {:+.1f}%",
+    10: "황금십자 발생!",
+    11: "죽음십자 발생!",
+    12: "황금십자 유지",
+    13: "죽음십자 유지",
+    14: "BB 상단 근접",
+    15: "BB 하단 근접",
+    16: "BB 중간 구간",
+    17: "MFI 과매도 ({:.1f})",
+    18: "MFI 과매수 ({:.1f})",
+    19: "MFI 중립 ({:.1f})",
+}
+
+_SMA200_CODE = 9  # value is a ratio; format_signal renders it as a percent
+
+
+def format_signal(sig: dict) -> str:
+    """Render the Korean label for one detect_signals entry."""
+    value = sig["value"]
+    if sig["code"] == _SMA200_CODE:
+        value = value * 100
+    return LABEL_TEMPLATES[sig["code"]].format(value)
+
+
+def detect_signals(row: pd.Series | dict, prev_row: pd.Series | dict | None = None) -> dict:
     """
     Compute individual technical signals from a latest-row of stock_prices.
-    Returns dict of {key: {value, signal, strength, label}}.
-    signal: 'BUY' | 'SELL' | 'NEUTRAL'
+    Returns dict of {key: {value, signal, strength, code}}.
+    signal: 'BUY' | 'SELL' | 'NEUTRAL'; code indexes LABEL_TEMPLATES
+    (render via format_signal).
     """
     results = {}
     close = row.get("close")
@@ -500,39 +818,39 @@ def detect_signals(row: pd.Series, prev_row: pd.Series | None = None) -> dict:
     rsi = row.get("rsi_14")
     if pd.notna(rsi):
         if rsi < 30:
-            results["rsi"] = {"value": rsi, "signal": "BUY",     "strength": 2, "label": f"과매도 ({rsi:.1f})"}
+            results["rsi"] = {"value": rsi, "signal": "BUY",     "strength": 2, "code": 1}
         elif rsi < 45:
-            results["rsi"] = {"value": rsi, "signal": "BUY",     "strength": 1, "label": f"매수 우위 ({rsi:.1f})"}
+            results["rsi"] = {"value": rsi, "signal": "BUY",     "strength": 1, "code": 2}
         elif rsi > 70:
-            results["rsi"] = {"value": rsi, "signal": "SELL",    "strength": 2, "label": f"과매수 ({rsi:.1f})"}
+            results["rsi"] = {"value": rsi, "signal": "SELL",    "strength": 2, "code": 3}
         elif rsi > 55:
-            results["rsi"] = {"value": rsi, "signal": "SELL",    "strength": 1, "label": f"매도 우위 ({rsi:.1f})"}
+            results["rsi"] = {"value": rsi, "signal": "SELL",    "strength": 1, "code": 4}
         else:
-            results["rsi"] = {"value": rsi, "signal": "NEUTRAL", "strength": 0, "label": f"중립 ({rsi:.1f})"}
+            results["rsi"] = {"value": rsi, "signal": "NEUTRAL", "strength": 0, "code": 5}
 
     # ── MACD ─────────────────────────────────────────────────────────────────
     macd, macd_sig = row.get("macd"), row.get("macd_signal")
     if pd.notna(macd) and pd.notna(macd_sig):
         diff = macd - macd_sig
         if diff > 0:
-            results["macd"] = {"value": diff, "signal": "BUY",     "strength": 1, "label": "MACD 강세"}
+            results["macd"] = {"value": diff, "signal": "BUY",     "strength": 1, "code": 6}
         elif diff < 0:
-            results["macd"] = {"value": diff, "signal": "SELL",    "strength": 1, "label": "MACD 약세"}
+            results["macd"] = {"value": diff, "signal": "SELL",    "strength": 1, "code": 7}
         else:
-            results["macd"] = {"value": diff, "signal": "NEUTRAL", "strength": 0, "label": "MACD 중립"}
+            results["macd"] = {"value": diff, "signal": "NEUTRAL", "strength": 0, "code": 8}
 
     # ── SMA 200 ──────────────────────────────────────────────────────────────
     sma200 = row.get("sma_200")
     if pd.notna(close) and pd.notna(sma200) and sma200 != 0:
         pct = (close - sma200) / sma200
         if pct > 0.05:
-            results["sma200"] = {"value": pct, "signal": "BUY",  "strength": 2, "label": f"SMA200 +{pct*100:.1f}%"}
+            results["sma200"] = {"value": pct, "signal": "BUY",  "strength": 2, "code": 9}
         elif pct > 0:
-            results["sma200"] = {"value": pct, "signal": "BUY",  "strength": 1, "label": f"SMA200 +{pct*100:.1f}%"}
+            results["sma200"] = {"value": pct, "signal": "BUY",  "strength": 1, "code": 9}
         elif pct < -0.05:
-            results["sma200"] = {"value": pct, "signal": "SELL", "strength": 2, "label": f"SMA200 {pct*100:.1f}%"}
+            results["sma200"] = {"value": pct, "signal": "SELL", "strength": 2, "code": 9}
         else:
-            results["sma200"] = {"value": pct, "signal": "SELL", "strength": 1, "label": f"SMA200 {pct*100:.1f}%"}
+            results["sma200"] = {"value": pct, "signal": "SELL", "strength": 1, "code": 9}
 
     # ── Golden / Death Cross ──────────────────────────────────────────────────
     sma50 = row.get("sma_50")
@@ -541,14 +859,14 @@ def detect_signals(row: pd.Series, prev_row: pd.Series | None = None) -> dict:
             p50, p200 = prev_row.get("sma_50"), prev_row.get("sma_200")
             if pd.notna(p50) and pd.notna(p200):
                 if p50 <= p200 and sma50 > sma200:
-                    results["cross"] = {"value": sma50, "signal": "BUY",  "strength": 2, "label": "황금십자 발생!"}
+                    results["cross"] = {"value": sma50, "signal": "BUY",  "strength": 2, "code": 10}
                 elif p50 >= p200 and sma50 < sma200:
-                    results["cross"] = {"value": sma50, "signal": "SELL", "strength": 2, "label": "죽음십자 발생!"}
+                    results["cross"] = {"value": sma50, "signal": "SELL", "strength": 2, "code": 11}
         if "cross" not in results:
             if sma50 > sma200:
-                results["cross"] = {"value": sma50, "signal": "BUY",  "strength": 1, "label": "황금십자 유지"}
+                results["cross"] = {"value": sma50, "signal": "BUY",  "strength": 1, "code": 12}
             else:
-                results["cross"] = {"value": sma50, "signal": "SELL", "strength": 1, "label": "죽음십자 유지"}
+                results["cross"] = {"value": sma50, "signal": "SELL", "strength": 1, "code": 13}
 
     # ── Bollinger Bands ───────────────────────────────────────────────────────
     bb_u, bb_l, bb_m = row.get("bb_upper"), row.get("bb_lower"), row.get("bb_middle")
@@ -556,21 +874,21 @@ def detect_signals(row: pd.Series, prev_row: pd.Series | None = None) -> dict:
         upper_zone = bb_m + 0.7 * (bb_u - bb_m)
         lower_zone = bb_m - 0.7 * (bb_m - bb_l)
         if close >= upper_zone:
-            results["bb"] = {"value": close, "signal": "SELL",    "strength": 1, "label": "BB 상단 근접"}
+            results["bb"] = {"value": close, "signal": "SELL",    "strength": 1, "code": 14}
         elif close <= lower_zone:
-            results["bb"] = {"value": close, "signal": "BUY",     "strength": 1, "label": "BB 하단 근접"}
+            results["bb"] = {"value": close, "signal": "BUY",     "strength": 1, "code": 15}
         else:
-            results["bb"] = {"value": close, "signal": "NEUTRAL", "strength": 0, "label": "BB 중간 구간"}
+            results["bb"] = {"value": close, "signal": "NEUTRAL", "strength": 0, "code": 16}
 
     # ── MFI ──────────────────────────────────────────────────────────────────
     mfi = row.get("mfi_14")
     if pd.notna(mfi):
         if mfi < 20:
-            results["mfi"] = {"value": mfi, "signal": "BUY",     "strength": 2, "label": f"MFI 과매도 ({mfi:.1f})"}
+            results["mfi"] = {"value": mfi, "signal": "BUY",     "strength": 2, "code": 17}
         elif mfi > 80:
-            results["mfi"] = {"value": mfi, "signal": "SELL",    "strength": 2, "label": f"MFI 과매수 ({mfi:.1f})"}
+            results["mfi"] = {"value": mfi, "signal": "SELL",    "strength": 2, "code": 18}
         else:
-            results["mfi"] = {"value": mfi, "signal": "NEUTRAL", "strength": 0, "label": f"MFI 중립 ({mfi:.1f})"}
+            results["mfi"] = {"value": mfi, "signal": "NEUTRAL", "strength": 0, "code": 19}
 
     return results
 
@@ -597,7 +915,115 @@ def compute_overall_signal(signals: dict) -> tuple[str, float]:
     return "중립", score
 
 
+def detect_signals_batch(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """
+    Vectorized counterpart of detect_signals for a whole overview-style DataFrame.
+    Returns {key: signed int8 strength array} — positive = BUY, negative = SELL,
+    0 = neutral or missing data. Mirrors the per-row logic (minus the prev_row
+    crossover events, which the overview path never supplies anyway).
+    """
+    n = len(df)
+
+    def _col(name: str) -> np.ndarray:
+        if name not in df.columns:
+            return np.full(n, np.nan)
+        return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype="float64")
+
+    close  = _col("close")
+    rsi    = _col("rsi_14")
+    macd   = _col("macd")
+    macd_s = _col("macd_signal")
+    sma50  = _col("sma_50")
+    sma200 = _col("sma_200")
+    bb_u   = _col("bb_upper")
+    bb_l   = _col("bb_lower")
+    bb_m   = _col("bb_middle")
+    mfi    = _col("mfi_14")
+
+    strengths = {}
+
+    strengths["rsi"] = np.select(
+        [rsi < 30, rsi < 45, rsi > 70, rsi > 55], [2, 1, -2, -1], default=0
+    ).astype("int8")
+
+    diff = macd - macd_s
+    strengths["macd"] = np.select([diff > 0, diff < 0], [1, -1], default=0).astype("int8")
+
+    pct = (close - sma200) / np.where(sma200 != 0, sma200, np.nan)
+    strengths["sma200"] = np.select(
+        [pct > 0.05, pct > 0, pct < -0.05, ~np.isnan(pct)], [2, 1, -2, -1], default=0
+    ).astype("int8")
+
+    cross_valid = ~(np.isnan(sma50) | np.isnan(sma200))
+    strengths["cross"] = np.select(
+        [cross_valid & (sma50 > sma200), cross_valid], [1, -1], default=0
+    ).astype("int8")
+
+    upper_zone = bb_m + 0.7 * (bb_u - bb_m)
+    lower_zone = bb_m - 0.7 * (bb_m - bb_l)
+    strengths["bb"] = np.select(
+        [close >= upper_zone, close <= lower_zone], [-1, 1], default=0
+    ).astype("int8")
+
+    strengths["mfi"] = np.select([mfi < 20, mfi > 80], [2, -2], default=0).astype("int8")
+
+    return strengths
+
+
+# _SIGNAL_WEIGHTS as a dense vector, in detect_signals_batch key order, so
+# the batch score is a single (N,6) @ (6,) matvec.
+_WEIGHT_KEYS = tuple(_SIGNAL_WEIGHTS)
+_WEIGHT_VEC = np.array([_SIGNAL_WEIGHTS[k] for k in _WEIGHT_KEYS], dtype="float32")
+
+
+def compute_overall_signal_batch(strengths: dict) -> tuple[np.ndarray, np.ndarray]:
+    """Weighted sum of signed strengths → (labels, scores) arrays."""
+    # One matvec over the stacked (N, 6) strength matrix instead of six
+    # weight×array passes with their temporaries.
+    mat = np.column_stack([strengths[k] for k in _WEIGHT_KEYS]).astype("float32")
+    score = mat @ _WEIGHT_VEC
+
+    labels = np.select(
+        [score >= 5.0, score >= 2.0, score <= -5.0, score <= -2.0],
+        ["강력매수", "매수", "강력매도", "매도"],
+        default="중립",
+    )
+    return labels, score
+
+
+def _overview_frame_fingerprint(df: pd.DataFrame) -> tuple:
+    """Cheap cache key for an overview frame — row count, last symbol and the
+    price checksum stand in for hashing every cell."""
+    if df.empty:
+        return (0,)
+    price_sum = (
+        float(pd.to_numeric(df["price"], errors="coerce").fillna(0).sum())
+        if "price" in df.columns else 0.0
+    )
+    return (len(df), str(df["symbol"].iloc[-1]), price_sum)
+
+
+@st.cache_data(ttl=300, hash_funcs={pd.DataFrame: _overview_frame_fingerprint})
+def score_overview(df: pd.DataFrame) -> pd.DataFrame:
+    """Batch signal labels/scores for an overview frame, indexed by symbol.
+
+    Shared by the screener and comparison pages so switching between them
+    reuses the cached result instead of re-running the signal pass.
+    """
+    if df.empty or "symbol" not in df.columns:
+        return pd.DataFrame(columns=["overall", "score"],
+                            index=pd.Index([], name="symbol"))
+    strengths = detect_signals_batch(df)
+    overall, score = compute_overall_signal_batch(strengths)
+    return pd.DataFrame(
+        {"overall": overall, "score": score},
+        index=pd.Index(df["symbol"], name="symbol"),
+    )
+
+
+@lru_cache(maxsize=8)
 def signal_badge_html(label: str) -> str:
+    # Only 5 distinct labels exist — after warm-up every call is a dict hit.
     bg, fg = SIGNAL_COLORS.get(label, SIGNAL_COLORS["중립"])
     return (
         f'<span style="background:{bg};color:{fg};padding:3px 10px;'
@@ -611,8 +1037,103 @@ def signal_icon(signal: str) -> str:
 
 # ── Chart builder ─────────────────────────────────────────────────────────────
 
-def build_chart(df: pd.DataFrame, symbol: str) -> go.Figure:
-    """4-panel chart: Candlestick+BB+MA / Volume / RSI / MACD."""
+# Cap on points per trace pushed to the browser. ~750 rows (3Y of trading
+# days) stay untouched; anything larger (intraday extensions, longer
+# backfills) gets binned before Plotly serializes it.
+_CHART_MAX_BINS = 1000
+
+# Shared figure styling — spread with **LAYOUT_DARK / reuse RANGEBREAKS so
+# every builder merges the same objects instead of re-allocating identical
+# dicts per rerun. Plain dicts, so importing them doesn't pull in plotly.
+LAYOUT_DARK = dict(
+    template="plotly_dark",
+    plot_bgcolor="#0e1117",
+    paper_bgcolor="#0e1117",
+    margin=dict(l=0, r=0, t=30, b=0),
+)
+RANGEBREAKS = [dict(bounds=["sat", "mon"])]
+
+
+def _downsample_ohlc(df: pd.DataFrame, max_bins: int = _CHART_MAX_BINS) -> pd.DataFrame:
+    """Aggregate an OHLCV frame down to ≤ max_bins rows for charting.
+
+    Rows are grouped positionally (so market holidays/weekend gaps don't
+    produce empty bins): open=first, high=max, low=min, close/indicators=last,
+    volume=sum. Candles stay visually faithful — each bin spans its true
+    high/low range.
+    """
+    if len(df) <= max_bins:
+        return df
+    step = -(-len(df) // max_bins)  # ceil division
+    bins = np.arange(len(df)) // step
+    _AGG = {"open": "first", "high": "max", "low": "min", "volume": "sum"}
+    agg = {c: _AGG.get(c, "last") for c in df.columns}
+    return df.groupby(bins).agg(agg).reset_index(drop=True)
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: pick n_out indices that preserve the
+    visual shape of (x, y). x ascending, both float64, no NaNs."""
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # First/last points are fixed; the interior splits into n_out-2 buckets.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = slice(edges[i + 1], edges[i + 2] if i < n_out - 3 else n)
+        avg_x, avg_y = x[nxt].mean(), y[nxt].mean()
+        # Triangle area of (previous pick, candidate, next-bucket centroid).
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+
+def downsample_line(x, y, n_out: int = _CHART_MAX_BINS) -> tuple[np.ndarray, np.ndarray]:
+    """LTTB-downsample one line trace to ≤ n_out points for Plotly.
+
+    Keeps peaks/troughs that uniform striding would drop. NaN points are
+    removed first — fine for daily indicator lines, whose NaNs are the
+    leading warm-up window. Candlesticks go through _downsample_ohlc
+    instead; LTTB has no meaningful aggregate for OHLC bars.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype="float64")
+    finite = ~np.isnan(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    if x.size <= n_out:
+        return x, y
+    xf = x.astype("datetime64[ns]").astype("int64") if x.dtype.kind == "M" \
+        else x.astype("float64")
+    keep = _lttb(xf.astype("float64"), y, n_out)
+    return x[keep], y[keep]
+
+
+def build_chart(df: pd.DataFrame, symbol: str) -> "go.Figure":
+    """4-panel chart: Candlestick+BB+MA / Volume / RSI / MACD.
+
+    Plotly is imported lazily so pages that never chart (overview, news,
+    screener) don't pay its import cost on a cold start.
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    df = _downsample_ohlc(df)
+
+    # One validity pass for every guarded trace — each notna().sum() guard
+    # re-scanned its whole column, and macd was checked twice.
+    valid = {
+        c: c in df.columns and int(df[c].notna().to_numpy().sum()) > 5
+        for c in ("sma_20", "sma_50", "sma_200", "bb_upper", "rsi_14", "macd")
+    }
+
     fig = make_subplots(
         rows=4, cols=1,
         shared_xaxes=True,
@@ -637,57 +1158,60 @@ def build_chart(df: pd.DataFrame, symbol: str) -> go.Figure:
         ("sma_50",  "#f57c00", "SMA 50"),
         ("sma_200", "#c62828", "SMA 200"),
     ]:
-        if col in df.columns and df[col].notna().sum() > 5:
-            fig.add_trace(go.Scatter(
+        if valid[col]:
+            fig.add_trace(go.Scattergl(
                 x=df["trade_date"], y=df[col],
                 name=name, line=dict(color=color, width=1.2), opacity=0.85,
             ), row=1, col=1)
 
     # ── Bollinger Bands ────────────────────────────────────────────────────────
-    if "bb_upper" in df.columns and df["bb_upper"].notna().sum() > 5:
-        fig.add_trace(go.Scatter(
+    if valid["bb_upper"]:
+        fig.add_trace(go.Scattergl(
             x=df["trade_date"], y=df["bb_upper"],
             name="BB Upper", line=dict(color="#9e9e9e", width=0.8, dash="dot"),
             showlegend=False,
         ), row=1, col=1)
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=df["trade_date"], y=df["bb_lower"],
             name="BB Bands", line=dict(color="#9e9e9e", width=0.8, dash="dot"),
             fill="tonexty", fillcolor="rgba(158,158,158,0.08)",
         ), row=1, col=1)
 
     # ── MACD crossover arrows ──────────────────────────────────────────────────
-    if "macd" in df.columns and df["macd"].notna().sum() > 5:
-        cross_up   = (df["macd"] > df["macd_signal"]) & (df["macd"].shift(1) <= df["macd_signal"].shift(1))
-        cross_down = (df["macd"] < df["macd_signal"]) & (df["macd"].shift(1) >= df["macd_signal"].shift(1))
-        buy_pts  = df[cross_up]
-        sell_pts = df[cross_down]
-        if not buy_pts.empty:
-            fig.add_trace(go.Scatter(
-                x=buy_pts["trade_date"], y=buy_pts["low"] * 0.98,
+    if valid["macd"]:
+        # Sign flips of (macd - signal) on raw ndarrays — no shifted-column
+        # copies or boolean row slices of the whole frame. NaN signs compare
+        # False, so warm-up rows drop out just like before.
+        diff = df["macd"].to_numpy() - df["macd_signal"].to_numpy()
+        s = np.sign(diff)
+        up_idx   = np.where((s[1:] > 0) & (s[:-1] <= 0))[0] + 1
+        down_idx = np.where((s[1:] < 0) & (s[:-1] >= 0))[0] + 1
+        dates = df["trade_date"].to_numpy()
+        if up_idx.size:
+            fig.add_trace(go.Scattergl(
+                x=dates[up_idx], y=df["low"].to_numpy()[up_idx] * 0.98,
                 mode="markers", marker=dict(symbol="triangle-up", size=10, color="#26a69a"),
                 name="MACD 매수", showlegend=True,
             ), row=1, col=1)
-        if not sell_pts.empty:
-            fig.add_trace(go.Scatter(
-                x=sell_pts["trade_date"], y=sell_pts["high"] * 1.02,
+        if down_idx.size:
+            fig.add_trace(go.Scattergl(
+                x=dates[down_idx], y=df["high"].to_numpy()[down_idx] * 1.02,
                 mode="markers", marker=dict(symbol="triangle-down", size=10, color="#ef5350"),
                 name="MACD 매도", showlegend=True,
             ), row=1, col=1)
 
     # ── Volume ────────────────────────────────────────────────────────────────
-    vol_colors = [
-        "#26a69a" if c >= o else "#ef5350"
-        for c, o in zip(df["close"], df["open"])
-    ]
+    vol_colors = np.where(
+        df["close"].to_numpy() >= df["open"].to_numpy(), "#26a69a", "#ef5350"
+    )
     fig.add_trace(go.Bar(
         x=df["trade_date"], y=df["volume"],
         name="Volume", marker_color=vol_colors, showlegend=False,
     ), row=2, col=1)
 
     # ── RSI ───────────────────────────────────────────────────────────────────
-    if "rsi_14" in df.columns and df["rsi_14"].notna().sum() > 5:
-        fig.add_trace(go.Scatter(
+    if valid["rsi_14"]:
+        fig.add_trace(go.Scattergl(
             x=df["trade_date"], y=df["rsi_14"],
             name="RSI 14", line=dict(color="#ab47bc", width=1.5),
         ), row=3, col=1)
@@ -697,30 +1221,49 @@ def build_chart(df: pd.DataFrame, symbol: str) -> go.Figure:
         fig.add_hline(y=30, line_dash="dash", line_color="rgba(38,166,154,0.5)", line_width=1, row=3, col=1)
 
     # ── MACD ──────────────────────────────────────────────────────────────────
-    if "macd" in df.columns and df["macd"].notna().sum() > 5:
-        hist_colors = ["#26a69a" if v >= 0 else "#ef5350" for v in df["macd_hist"].fillna(0)]
+    if valid["macd"]:
+        hist_colors = np.where(df["macd_hist"].fillna(0).to_numpy() >= 0, "#26a69a", "#ef5350")
         fig.add_trace(go.Bar(
             x=df["trade_date"], y=df["macd_hist"],
             name="Histogram", marker_color=hist_colors, showlegend=False,
         ), row=4, col=1)
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=df["trade_date"], y=df["macd"],
             name="MACD", line=dict(color="#1565c0", width=1.5),
         ), row=4, col=1)
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=df["trade_date"], y=df["macd_signal"],
             name="Signal", line=dict(color="#f57c00", width=1.5),
         ), row=4, col=1)
 
     fig.update_layout(
         height=820,
-        template="plotly_dark",
         xaxis_rangeslider_visible=False,
         legend=dict(orientation="h", yanchor="bottom", y=1.01, xanchor="right", x=1),
-        margin=dict(l=0, r=0, t=30, b=0),
-        plot_bgcolor="#0e1117",
-        paper_bgcolor="#0e1117",
+        **LAYOUT_DARK,
     )
     fig.update_yaxes(showgrid=True, gridcolor="#1e2130", gridwidth=0.5)
-    fig.update_xaxes(showgrid=False, rangebreaks=[dict(bounds=["sat", "mon"])])
+    fig.update_xaxes(showgrid=False, rangebreaks=RANGEBREAKS)
     return fig
+
+
+def _price_frame_fingerprint(df: pd.DataFrame) -> tuple:
+    """Cheap cache key for a price frame — shape + last trade date stand in
+    for hashing every cell."""
+    if df.empty or "trade_date" not in df.columns:
+        return (df.shape,)
+    return (df.shape, str(df["trade_date"].iloc[-1]))
+
+
+@st.cache_data(ttl=300, hash_funcs={pd.DataFrame: _price_frame_fingerprint})
+def build_chart_cached(df: pd.DataFrame, symbol: str) -> str:
+    """build_chart memoized as JSON.
+
+    Rebuilding 10+ validated graph_objects traces per rerun is the expensive
+    part; the JSON string comes straight out of the cache on repeat views.
+    uirevision keeps the client's zoom/pan state across reruns. Rehydrate
+    with plotly.io.from_json.
+    """
+    fig = build_chart(df, symbol)
+    fig.update_layout(uirevision="persist")
+    return fig.to_json()
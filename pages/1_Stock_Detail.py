@@ -4,14 +4,15 @@ Stock Detail — Full chart + signals + fundamentals + news.
 
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
 import streamlit as st
 from plotly.subplots import make_subplots
 
 import _nav
 from db import (
-    SYMBOL_NAMES, TIMEFRAME_DAYS,
-    build_chart, compute_overall_signal, detect_signals,
-    load_fundamentals, load_news, load_prices, load_symbols,
+    LAYOUT_DARK, RANGEBREAKS, SYMBOL_NAMES, TIMEFRAME_DAYS,
+    build_chart_cached, compute_overall_signal, detect_signals, downsample_line,
+    format_signal, load_fundamentals, load_news, load_prices, load_symbols,
     signal_badge_html, signal_icon,
 )
 
@@ -50,7 +51,12 @@ with st.sidebar:
     )
     st.divider()
     if st.button("↺  새로고침", use_container_width=True):
-        st.cache_data.clear()
+        # Scoped invalidation — only this page's loaders. The figure caches
+        # key on data fingerprints, so they refresh with the data.
+        load_symbols.clear()
+        load_prices.clear()
+        load_fundamentals.clear()
+        load_news.clear()
         st.rerun()
     _nav.status_bar("Yahoo Finance · 기술적 지표")
 
@@ -60,47 +66,64 @@ if df.empty:
     st.warning(f"**{symbol}** 데이터 없음.")
     st.stop()
 
-latest = df.iloc[-1]
-prev   = df.iloc[-2] if len(df) > 1 else latest
+# Plain dict rows — no per-rerun Series construction for the two rows the
+# header and signal panel actually read.
+_rows  = df.tail(2).to_dict("records")
+latest = _rows[-1]
+prev   = _rows[-2] if len(_rows) > 1 else latest
+
+_close_ok = pd.notna(latest["close"]) and pd.notna(prev["close"])
+chg     = latest["close"] - prev["close"] if _close_ok else 0.0
+chg_pct = chg / prev["close"] * 100 if _close_ok and prev["close"] else 0.0
+
+
+def _fmt(val, spec: str = "{:,.2f}") -> str:
+    return spec.format(val) if pd.notna(val) else "—"
 
-chg     = latest["close"] - prev["close"]
-chg_pct = chg / prev["close"] * 100 if prev["close"] else 0
 
 # ── Header metrics ────────────────────────────────────────────────────────────
 name = SYMBOL_NAMES.get(symbol, symbol)
 st.title(f"📈 {symbol}  {name}")
 
 m1, m2, m3, m4, m5, m6 = st.columns(6)
-close_fmt = f"{latest['close']:,.2f}" if pd.notna(latest["close"]) else "—"
-m1.metric("종가",   close_fmt,        f"{chg:+.2f} ({chg_pct:+.2f}%)")
-m2.metric("고가",   f"{latest['high']:,.2f}" if pd.notna(latest["high"]) else "—")
-m3.metric("저가",   f"{latest['low']:,.2f}"  if pd.notna(latest["low"])  else "—")
-m4.metric("거래량", f"{int(latest['volume']):,}" if pd.notna(latest["volume"]) else "—")
-m5.metric("RSI 14", f"{latest['rsi_14']:.1f}"  if pd.notna(latest["rsi_14"]) else "—")
-m6.metric("MFI 14", f"{latest['mfi_14']:.1f}"  if pd.notna(latest["mfi_14"]) else "—")
+m1.metric("종가",   _fmt(latest["close"]), f"{chg:+.2f} ({chg_pct:+.2f}%)")
+m2.metric("고가",   _fmt(latest["high"]))
+m3.metric("저가",   _fmt(latest["low"]))
+m4.metric("거래량", _fmt(latest["volume"], "{:,.0f}"))
+m5.metric("RSI 14", _fmt(latest["rsi_14"], "{:.1f}"))
+m6.metric("MFI 14", _fmt(latest["mfi_14"], "{:.1f}"))
 
 # ── Main chart ────────────────────────────────────────────────────────────────
-st.plotly_chart(build_chart(df, symbol), use_container_width=True)
+st.plotly_chart(pio.from_json(build_chart_cached(df, symbol)), use_container_width=True)
 
 # ── Additional indicator charts ───────────────────────────────────────────────
-if indicator_choice:
-    n = len(indicator_choice)
+_IND_COLORS = {"CCI": "#ff7043", "ATR": "#42a5f5", "OBV": "#66bb6a", "MFI": "#ab47bc"}
+_IND_PANELS = {"CCI": ("cci_20", -100, 100), "ATR": ("atr_14", None, None),
+               "OBV": ("obv", None, None), "MFI": ("mfi_14", 20, 80)}
+
+
+# df rides in under a cheap fingerprint — (symbol, inds) key the cache,
+# shape+last date only invalidate it when new rows land.
+@st.cache_data(
+    ttl=300,
+    hash_funcs={pd.DataFrame: lambda d: (d.shape, str(d["trade_date"].iloc[-1]) if len(d) else "")},
+)
+def _build_extra_fig(df: pd.DataFrame, symbol: str, inds: tuple[str, ...]) -> str:
+    n = len(inds)
     extra_fig = make_subplots(
         rows=n, cols=1,
         shared_xaxes=True,
         vertical_spacing=0.04,
-        subplot_titles=indicator_choice,
+        subplot_titles=inds,
     )
-    colors = {"CCI": "#ff7043", "ATR": "#42a5f5", "OBV": "#66bb6a", "MFI": "#ab47bc"}
-    hrefs = {"CCI": ("cci_20", -100, 100), "ATR": ("atr_14", None, None),
-             "OBV": ("obv", None, None), "MFI": ("mfi_14", 20, 80)}
 
-    for i, ind in enumerate(indicator_choice, 1):
-        col, lo, hi = hrefs.get(ind, (ind.lower(), None, None))
+    for i, ind in enumerate(inds, 1):
+        col, lo, hi = _IND_PANELS.get(ind, (ind.lower(), None, None))
         if col in df.columns and df[col].notna().sum() > 2:
+            x_ds, y_ds = downsample_line(df["trade_date"], df[col])
             extra_fig.add_trace(go.Scatter(
-                x=df["trade_date"], y=df[col],
-                name=ind, line=dict(color=colors.get(ind, "#ffffff"), width=1.5),
+                x=x_ds, y=y_ds,
+                name=ind, line=dict(color=_IND_COLORS.get(ind, "#ffffff"), width=1.5),
             ), row=i, col=1)
             if lo is not None:
                 extra_fig.add_hline(y=lo, line_dash="dash",
@@ -111,15 +134,20 @@ if indicator_choice:
 
     extra_fig.update_layout(
         height=200 * n,
-        template="plotly_dark",
-        plot_bgcolor="#0e1117",
-        paper_bgcolor="#0e1117",
-        margin=dict(l=0, r=0, t=30, b=0),
         showlegend=False,
+        uirevision="persist",
+        **LAYOUT_DARK,
     )
-    extra_fig.update_xaxes(rangebreaks=[dict(bounds=["sat", "mon"])])
+    extra_fig.update_xaxes(rangebreaks=RANGEBREAKS)
     extra_fig.update_yaxes(showgrid=True, gridcolor="#1e2130", gridwidth=0.5)
-    st.plotly_chart(extra_fig, use_container_width=True)
+    return extra_fig.to_json()
+
+
+if indicator_choice:
+    st.plotly_chart(
+        pio.from_json(_build_extra_fig(df, symbol, tuple(indicator_choice))),
+        use_container_width=True,
+    )
 
 st.divider()
 
@@ -157,7 +185,7 @@ for i in range(0, len(items), 3):
                 f"""
                 <div style="border:1px solid #2e2e3e;border-radius:8px;padding:12px;margin:4px 0">
                   <div style="font-size:0.8em;color:#9e9e9e">{label}</div>
-                  <div style="font-size:1.1em;font-weight:bold">{icon} {sig['label']}</div>
+                  <div style="font-size:1.1em;font-weight:bold">{icon} {format_signal(sig)}</div>
                   <div style="font-size:0.75em;color:#616161;margin-top:4px">강도: {'●' * sig['strength']}{'○' * (2 - sig['strength'])}</div>
                 </div>
                 """,
@@ -194,8 +222,10 @@ with tab_ind:
         "rsi_14", "macd", "macd_signal",
         "cci_20", "atr_14", "mfi_14",
     ]
+    # load_prices rows arrive ORDER BY trade_date — reversing the slice
+    # replaces the sort.
     st.dataframe(
-        df[show_cols].tail(60).sort_values("trade_date", ascending=False),
+        df[show_cols].iloc[-60:][::-1],
         use_container_width=True, hide_index=True,
     )
 
@@ -2,15 +2,12 @@
 Screener — Filter all tracked symbols by technical conditions.
 """
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 import _nav
-from db import (
-    SYMBOL_NAMES,
-    compute_overall_signal, detect_signals, load_overview_data,
-    signal_badge_html,
-)
+from db import SYMBOL_NAMES, load_overview_data, score_overview
 
 st.set_page_config(page_title="AlphaBoard — 스크리너", page_icon="🔍", layout="wide")
 _nav.inject()
@@ -30,7 +27,8 @@ with st.sidebar:
     )
     st.divider()
     if st.button("↺  새로고침", use_container_width=True):
-        st.cache_data.clear()
+        # Scoped invalidation — this page only reads the overview frame.
+        load_overview_data.clear()
         st.rerun()
     _nav.status_bar("기술적 지표 기반 필터")
 
@@ -43,76 +41,86 @@ if df.empty:
     st.stop()
 
 # ── Build screener rows ───────────────────────────────────────────────────────
-records = []
-for _, row in df.iterrows():
-    sym     = row["symbol"]
-    signals = detect_signals(row)
-    overall, score = compute_overall_signal(signals)
-
-    # Derive human-readable conditions
-    rsi_val = row.get("rsi_14")
-
-    # MA200 position
-    sma200 = row.get("sma_200")
-    close  = row.get("price")
-    ma200_str = "상방" if (pd.notna(close) and pd.notna(sma200) and close > sma200) else "하방"
-
-    # MACD direction
-    macd_str = "강세" if (pd.notna(row.get("macd")) and pd.notna(row.get("macd_signal")) and
-                          row.get("macd", 0) > row.get("macd_signal", 0)) else "약세"
-
-    # BB position
-    bb_u, bb_l, bb_m = row.get("bb_upper"), row.get("bb_lower"), row.get("bb_middle")
-    bb_str = "중간 구간"
-    if pd.notna(close) and pd.notna(bb_u) and pd.notna(bb_l) and pd.notna(bb_m):
-        upper_z = bb_m + 0.7 * (bb_u - bb_m)
-        lower_z = bb_m - 0.7 * (bb_m - bb_l)
-        if close >= upper_z:
-            bb_str = "상단 근접"
-        elif close <= lower_z:
-            bb_str = "하단 근접"
-
-    records.append({
-        "symbol":    sym,
-        "종목":       sym,
-        "회사명":      SYMBOL_NAMES.get(sym, sym),
-        "현재가":      close,
-        "RSI":        round(rsi_val, 1) if pd.notna(rsi_val) else None,
-        "SMA200":     ma200_str,
-        "MACD":       macd_str,
-        "BB 위치":    bb_str,
-        "종합 신호":   overall,
-        "신호 점수":   round(score, 2),
-        "_rsi":       rsi_val,
-    })
-
-screen_df = pd.DataFrame(records)
+# Shared memoized signal pass — the comparison page reads the same result,
+# so flipping between the two pages doesn't rescore the universe.
+sig_df  = score_overview(df)
+overall = sig_df["overall"].to_numpy()
+score   = sig_df["score"].to_numpy()
+
+
+def _col(name: str) -> np.ndarray:
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype="float64")
+
+
+close  = _col("price")
+rsi    = _col("rsi_14")
+sma200 = _col("sma_200")
+macd, macd_s = _col("macd"), _col("macd_signal")
+bb_u, bb_l, bb_m = _col("bb_upper"), _col("bb_lower"), _col("bb_middle")
+
+# NaN comparisons are False, which lands each row on the same fallback label
+# the notna-guarded per-row branches produced.
+ma200_str = np.where(close > sma200, "상방", "하방")
+macd_str  = np.where(macd > macd_s, "강세", "약세")
+
+upper_z = bb_m + 0.7 * (bb_u - bb_m)
+lower_z = bb_m - 0.7 * (bb_m - bb_l)
+bb_str = np.select(
+    [close >= upper_z, close <= lower_z],
+    ["상단 근접", "하단 근접"],
+    default="중간 구간",
+)
+
+syms = df["symbol"]
+screen_df = pd.DataFrame({
+    "symbol":    syms.to_numpy(),
+    "종목":       syms.to_numpy(),
+    "회사명":      syms.map(SYMBOL_NAMES).fillna(syms).to_numpy(),
+    "현재가":      close,
+    "RSI":        np.round(rsi, 1),
+    "SMA200":     ma200_str,
+    "MACD":       macd_str,
+    "BB 위치":    bb_str,
+    "종합 신호":   overall,
+    "신호 점수":   np.round(score, 2),
+    "_rsi":       rsi,
+}, copy=False)
+
+# Tiny fixed label sets — categorical codes make the .isin filters integer
+# comparisons and drop the per-row Python string objects.
+screen_df["SMA200"]  = pd.Categorical(ma200_str, categories=["상방", "하방"])
+screen_df["MACD"]    = pd.Categorical(macd_str, categories=["강세", "약세"])
+screen_df["BB 위치"] = pd.Categorical(bb_str, categories=["상단 근접", "중간 구간", "하단 근접"])
+screen_df["종합 신호"] = pd.Categorical(
+    overall, categories=["강력매도", "매도", "중립", "매수", "강력매수"], ordered=True
+)
 
 # ── Apply filters ─────────────────────────────────────────────────────────────
-mask = pd.Series([True] * len(screen_df))
+# Raw boolean ndarray accumulator — no index alignment per &= and no
+# Python list → Series seed.
+mask = np.ones(len(screen_df), dtype=bool)
 
 # RSI range
-if screen_df["_rsi"].notna().any():
-    mask &= (
-        screen_df["_rsi"].isna() |
-        ((screen_df["_rsi"] >= rsi_range[0]) & (screen_df["_rsi"] <= rsi_range[1]))
-    )
+if not np.isnan(rsi).all():
+    mask &= np.isnan(rsi) | ((rsi >= rsi_range[0]) & (rsi <= rsi_range[1]))
 
 # MA200 position
 if ma200_pos:
-    mask &= screen_df["SMA200"].isin(ma200_pos)
+    mask &= screen_df["SMA200"].isin(ma200_pos).to_numpy()
 
 # MACD direction
 if macd_dir:
-    mask &= screen_df["MACD"].isin(macd_dir)
+    mask &= screen_df["MACD"].isin(macd_dir).to_numpy()
 
 # BB position
 if bb_pos:
-    mask &= screen_df["BB 위치"].isin(bb_pos)
+    mask &= screen_df["BB 위치"].isin(bb_pos).to_numpy()
 
 # Signal filter
 if sig_filter:
-    mask &= screen_df["종합 신호"].isin(sig_filter)
+    mask &= screen_df["종합 신호"].isin(sig_filter).to_numpy()
 
 result = screen_df[mask].drop(columns=["symbol", "_rsi"])
 result = result.sort_values("신호 점수", ascending=False)
@@ -121,31 +129,38 @@ result = result.sort_values("신호 점수", ascending=False)
 st.metric("조건 충족 종목", f"{len(result)} / {len(screen_df)}")
 st.divider()
 
-def _signal_color(val):
-    m = {"강력매수": "color:#a5d6a7;font-weight:bold", "매수": "color:#c8e6c9",
-         "중립": "color:#b0bec5", "매도": "color:#ffcdd2", "강력매도": "color:#ef9a9a;font-weight:bold"}
-    return m.get(val, "")
+# Column-wise CSS builders for Styler.apply — one np.select/np.where pass per
+# column instead of Styler.map's per-cell Python dispatch.
+def _signal_css(col: pd.Series) -> np.ndarray:
+    return np.select(
+        [col == "강력매수", col == "매수", col == "중립", col == "매도", col == "강력매도"],
+        ["color:#a5d6a7;font-weight:bold", "color:#c8e6c9", "color:#b0bec5",
+         "color:#ffcdd2", "color:#ef9a9a;font-weight:bold"],
+        default="",
+    )
 
-def _ma_color(val):
-    return "color:#26a69a" if val == "상방" else "color:#ef5350"
+def _ma_css(col: pd.Series) -> np.ndarray:
+    return np.where(col == "상방", "color:#26a69a", "color:#ef5350")
 
-def _macd_color(val):
-    return "color:#26a69a" if val == "강세" else "color:#ef5350"
+def _macd_css(col: pd.Series) -> np.ndarray:
+    return np.where(col == "강세", "color:#26a69a", "color:#ef5350")
 
-def _bb_color(val):
-    if val == "상단 근접": return "color:#ef5350"
-    if val == "하단 근접": return "color:#26a69a"
-    return ""
+def _bb_css(col: pd.Series) -> np.ndarray:
+    return np.select(
+        [col == "상단 근접", col == "하단 근접"],
+        ["color:#ef5350", "color:#26a69a"],
+        default="",
+    )
 
 if result.empty:
     st.info("조건에 맞는 종목이 없습니다. 필터를 조정해보세요.")
 else:
     styled = (
         result.style
-        .map(_signal_color, subset=["종합 신호"])
-        .map(_ma_color,     subset=["SMA200"])
-        .map(_macd_color,   subset=["MACD"])
-        .map(_bb_color,     subset=["BB 위치"])
+        .apply(_signal_css, subset=["종합 신호"])
+        .apply(_ma_css,     subset=["SMA200"])
+        .apply(_macd_css,   subset=["MACD"])
+        .apply(_bb_css,     subset=["BB 위치"])
         .format({
             "현재가": lambda v: f"{v:,.2f}" if pd.notna(v) else "—",
             "RSI":    lambda v: f"{v:.1f}"  if pd.notna(v) else "—",
@@ -2,15 +2,17 @@
 Comparison — Normalized price chart + side-by-side metrics for multiple symbols.
 """
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
 import streamlit as st
 
 import _nav
 from db import (
-    SYMBOL_NAMES, TIMEFRAME_DAYS,
-    compute_overall_signal, detect_signals,
-    load_fundamentals, load_multi_prices, load_overview_data, load_symbols,
+    LAYOUT_DARK, RANGEBREAKS, SYMBOL_DISPLAY, SYMBOL_NAMES, TIMEFRAME_DAYS,
+    downsample_line, load_fundamentals_all, load_multi_prices,
+    load_overview_data, load_symbols, score_overview,
 )
 
 COLORS = [
@@ -33,7 +35,7 @@ with st.sidebar:
         "비교할 종목 선택 (2~5개)",
         all_syms,
         default=default_syms,
-        format_func=lambda s: f"{s} — {SYMBOL_NAMES.get(s, s)}",
+        format_func=lambda s: SYMBOL_DISPLAY.get(s, s),
         max_selections=5,
         label_visibility="collapsed",
     )
@@ -45,7 +47,12 @@ with st.sidebar:
     normalize = st.checkbox("수익률 정규화 (100 기준)", value=True)
     st.divider()
     if st.button("↺  새로고침", use_container_width=True):
-        st.cache_data.clear()
+        # Scoped invalidation — only this page's loaders; the memoized
+        # figures key on the reloaded frames.
+        load_symbols.clear()
+        load_multi_prices.clear()
+        load_overview_data.clear()
+        load_fundamentals_all.clear()
         st.rerun()
     _nav.status_bar("상대 수익률 · 기술적 비교")
 
@@ -65,73 +72,97 @@ if raw_df.empty:
 raw_df["trade_date"] = pd.to_datetime(raw_df["trade_date"])
 
 # ── Normalized price chart ────────────────────────────────────────────────────
-fig = go.Figure()
+# Figure construction is a pure function of its inputs — memoize it as JSON
+# so sidebar reruns rehydrate instead of rebuilding the traces. raw_df rides
+# in under a cheap shape+last-date fingerprint.
+@st.cache_data(
+    ttl=300,
+    hash_funcs={pd.DataFrame: lambda d: (d.shape, str(d["trade_date"].iloc[-1]) if len(d) else "")},
+)
+def _build_overlay_fig(raw_df: pd.DataFrame, selected: tuple[str, ...], normalize: bool) -> str:
+    fig = go.Figure()
+
+    for i, sym in enumerate(selected):
+        sym_df = raw_df[raw_df["symbol"] == sym].sort_values("trade_date")
+        if sym_df.empty:
+            continue
+        color = COLORS[i % len(COLORS)]
+        if normalize:
+            base = sym_df["close"].dropna().iloc[0]
+            y_values = sym_df["close"] / base * 100 if base else sym_df["close"]
+        else:
+            y_values = sym_df["close"]
+
+        x_ds, y_ds = downsample_line(sym_df["trade_date"], y_values)
+        # WebGL traces — SVG Scatter builds one DOM node per point.
+        fig.add_trace(go.Scattergl(
+            x=x_ds,
+            y=y_ds,
+            name=f"{sym} {SYMBOL_NAMES.get(sym, '')}",
+            line=dict(color=color, width=2),
+        ))
 
-for i, sym in enumerate(selected):
-    sym_df = raw_df[raw_df["symbol"] == sym].sort_values("trade_date")
-    if sym_df.empty:
-        continue
-    color = COLORS[i % len(COLORS)]
     if normalize:
-        base = sym_df["close"].dropna().iloc[0]
-        y_values = sym_df["close"] / base * 100 if base else sym_df["close"]
-        y_label  = "수익률 (기준=100)"
-    else:
-        y_values = sym_df["close"]
-        y_label  = "가격"
-
-    fig.add_trace(go.Scatter(
-        x=sym_df["trade_date"],
-        y=y_values,
-        name=f"{sym} {SYMBOL_NAMES.get(sym, '')}",
-        line=dict(color=color, width=2),
-    ))
-
-if normalize:
-    fig.add_hline(y=100, line_dash="dash", line_color="rgba(255,255,255,0.3)", line_width=1)
-
-fig.update_layout(
-    height=500,
-    template="plotly_dark",
-    plot_bgcolor="#0e1117",
-    paper_bgcolor="#0e1117",
-    yaxis_title=y_label if normalize else "가격",
-    xaxis_title="날짜",
-    legend=dict(orientation="h", yanchor="bottom", y=1.01, xanchor="right", x=1),
-    margin=dict(l=0, r=0, t=30, b=0),
+        fig.add_hline(y=100, line_dash="dash", line_color="rgba(255,255,255,0.3)", line_width=1)
+
+    fig.update_layout(
+        height=500,
+        yaxis_title="수익률 (기준=100)" if normalize else "가격",
+        xaxis_title="날짜",
+        legend=dict(orientation="h", yanchor="bottom", y=1.01, xanchor="right", x=1),
+        uirevision="persist",
+        **LAYOUT_DARK,
+    )
+    fig.update_xaxes(showgrid=False, rangebreaks=RANGEBREAKS)
+    fig.update_yaxes(showgrid=True, gridcolor="#1e2130", gridwidth=0.5)
+    return fig.to_json()
+
+
+st.plotly_chart(
+    pio.from_json(_build_overlay_fig(raw_df, tuple(selected), normalize)),
+    use_container_width=True,
 )
-fig.update_xaxes(showgrid=False, rangebreaks=[dict(bounds=["sat", "mon"])])
-fig.update_yaxes(showgrid=True, gridcolor="#1e2130", gridwidth=0.5)
-st.plotly_chart(fig, use_container_width=True)
 
 # ── Period return summary ─────────────────────────────────────────────────────
 st.divider()
 st.subheader("기간별 수익률")
 
 ov_df = load_overview_data()
-ov_map = {r["symbol"]: r for _, r in ov_df.iterrows()} if not ov_df.empty else {}
 
-ret_records = []
-for sym in selected:
-    ov = ov_map.get(sym, {})
-    ret_records.append({
-        "종목":      sym,
-        "회사명":     SYMBOL_NAMES.get(sym, sym),
-        "현재가":     ov.get("price"),
-        "1일(%)":    ov.get("ret_1d"),
-        "1주(%)":    ov.get("ret_1w"),
-        "1개월(%)":  ov.get("ret_1m"),
-        "1년(%)":    ov.get("ret_1y"),
-    })
-ret_df = pd.DataFrame(ret_records)
-
-def _pct_color(v):
-    if pd.isna(v): return ""
-    return "color:#26a69a" if v > 0 else "color:#ef5350"
+# Indexed gather of just the selected rows — the old per-symbol dict of
+# iterrows Series materialized the whole universe.
+ov_sel = (
+    ov_df.set_index("symbol").reindex(selected)
+    if not ov_df.empty
+    else pd.DataFrame(index=pd.Index(selected, name="symbol"))
+)
+
+
+def _ov_col(name: str) -> np.ndarray:
+    if name not in ov_sel.columns:
+        return np.full(len(ov_sel), np.nan)
+    return pd.to_numeric(ov_sel[name], errors="coerce").to_numpy(dtype="float64")
+
+
+names = [SYMBOL_NAMES.get(s, s) for s in selected]
+ret_df = pd.DataFrame({
+    "종목":      list(selected),
+    "회사명":     names,
+    "현재가":     _ov_col("price"),
+    "1일(%)":    _ov_col("ret_1d"),
+    "1주(%)":    _ov_col("ret_1w"),
+    "1개월(%)":  _ov_col("ret_1m"),
+    "1년(%)":    _ov_col("ret_1y"),
+})
+
+# Column-wise CSS for Styler.apply — one array pass instead of per-cell calls.
+def _pct_css(col: pd.Series) -> np.ndarray:
+    v = col.to_numpy(dtype="float64")
+    return np.where(np.isnan(v), "", np.where(v > 0, "color:#26a69a", "color:#ef5350"))
 
 st.dataframe(
     ret_df.style
-    .map(_pct_color, subset=["1일(%)", "1주(%)", "1개월(%)", "1년(%)"])
+    .apply(_pct_css, subset=["1일(%)", "1주(%)", "1개월(%)", "1년(%)"])
     .format({
         "현재가":    lambda v: f"{v:,.2f}" if pd.notna(v) else "—",
         "1일(%)":   lambda v: f"{v:+.2f}%" if pd.notna(v) else "—",
@@ -146,38 +177,43 @@ st.dataframe(
 st.divider()
 st.subheader("주요 지표 비교")
 
-ind_records = []
-for sym in selected:
-    ov = ov_map.get(sym, {})
-    sigs = detect_signals(ov) if ov else {}
-    overall, score = compute_overall_signal(sigs) if sigs else ("중립", 0)
-
-    rsi_v  = ov.get("rsi_14")
-    sma200 = ov.get("sma_200")
-    price  = ov.get("price")
-    macd   = ov.get("macd")
-    macd_s = ov.get("macd_signal")
-
-    ind_records.append({
-        "종목":       sym,
-        "회사명":      SYMBOL_NAMES.get(sym, sym),
-        "RSI":        round(rsi_v, 1) if pd.notna(rsi_v) else None,
-        "vs SMA200":  f"{(price/sma200-1)*100:+.1f}%" if pd.notna(price) and pd.notna(sma200) and sma200 else "—",
-        "MACD":       "강세" if (pd.notna(macd) and pd.notna(macd_s) and macd > macd_s) else "약세",
-        "종합 신호":   overall,
-        "신호 점수":   round(score, 2),
-    })
-
-ind_df = pd.DataFrame(ind_records)
-
-def _signal_color(val):
-    m = {"강력매수": "color:#a5d6a7;font-weight:bold", "매수": "color:#c8e6c9",
-         "중립": "color:#b0bec5", "매도": "color:#ffcdd2", "강력매도": "color:#ef9a9a;font-weight:bold"}
-    return m.get(val, "")
+# Shared memoized signal pass over the whole universe (same cache entry the
+# screener reads) — gather the picks by symbol. Missing symbols reindex to
+# NaN and fall back to 중립/0, same as the old empty-dict fallback.
+sig_sel = score_overview(ov_df).reindex(selected)
+overall = sig_sel["overall"].fillna("중립").to_numpy()
+score   = sig_sel["score"].fillna(0.0).to_numpy(dtype="float64")
+
+price, sma200 = _ov_col("price"), _ov_col("sma_200")
+macd, macd_s  = _ov_col("macd"), _ov_col("macd_signal")
+
+with np.errstate(divide="ignore", invalid="ignore"):
+    vs_sma200 = (price / sma200 - 1) * 100
+vs_str = np.where(
+    np.isfinite(vs_sma200), pd.Series(vs_sma200).map("{:+.1f}%".format), "—"
+)
+
+ind_df = pd.DataFrame({
+    "종목":       list(selected),
+    "회사명":      names,
+    "RSI":        np.round(_ov_col("rsi_14"), 1),
+    "vs SMA200":  vs_str,
+    "MACD":       np.where(macd > macd_s, "강세", "약세"),
+    "종합 신호":   overall,
+    "신호 점수":   np.round(score, 2),
+})
+
+def _signal_css(col: pd.Series) -> np.ndarray:
+    return np.select(
+        [col == "강력매수", col == "매수", col == "중립", col == "매도", col == "강력매도"],
+        ["color:#a5d6a7;font-weight:bold", "color:#c8e6c9", "color:#b0bec5",
+         "color:#ffcdd2", "color:#ef9a9a;font-weight:bold"],
+        default="",
+    )
 
 st.dataframe(
     ind_df.style
-    .map(_signal_color, subset=["종합 신호"])
+    .apply(_signal_css, subset=["종합 신호"])
     .format({"RSI": lambda v: f"{v:.1f}" if pd.notna(v) else "—"}),
     use_container_width=True, hide_index=True,
 )
@@ -186,14 +222,16 @@ st.dataframe(
 st.divider()
 st.subheader("펀더멘털 비교")
 
+# One DISTINCT ON query for every symbol instead of a round-trip per pick.
+fund_all = load_fundamentals_all()
+
 fund_records = []
 for sym in selected:
-    f = load_fundamentals(sym)
-    if f.empty:
+    if fund_all.empty or sym not in fund_all.index:
         fund_records.append({"종목": sym, "회사명": SYMBOL_NAMES.get(sym, sym),
                               "시가총액": "—", "PER": "—", "PBR": "—", "ROE": "—", "EPS": "—"})
     else:
-        r = f.iloc[0]
+        r = fund_all.loc[sym]
         mc = r.get("market_cap")
         fund_records.append({
             "종목":    sym,
@@ -211,7 +249,8 @@ st.dataframe(pd.DataFrame(fund_records), use_container_width=True, hide_index=Tr
 st.divider()
 st.subheader("수익률 비교 (기간별 막대)")
 
-if not ret_df.empty:
+@st.cache_data(ttl=300)
+def _build_bar_fig(ret_df: pd.DataFrame, selected: tuple[str, ...]) -> str:
     period_cols = ["1일(%)", "1주(%)", "1개월(%)", "1년(%)"]
     bar_fig = go.Figure()
     for i, sym in enumerate(selected):
@@ -230,11 +269,16 @@ if not ret_df.empty:
     bar_fig.update_layout(
         height=350,
         barmode="group",
-        template="plotly_dark",
-        plot_bgcolor="#0e1117",
-        paper_bgcolor="#0e1117",
-        margin=dict(l=0, r=0, t=10, b=0),
         yaxis_title="수익률 (%)",
         legend=dict(orientation="h", yanchor="bottom", y=1.01, xanchor="right", x=1),
+        # Tighter top margin than the shared default — no subplot titles here.
+        **{**LAYOUT_DARK, "margin": dict(l=0, r=0, t=10, b=0)},
+    )
+    return bar_fig.to_json()
+
+
+if not ret_df.empty:
+    st.plotly_chart(
+        pio.from_json(_build_bar_fig(ret_df, tuple(selected))),
+        use_container_width=True,
     )
-    st.plotly_chart(bar_fig, use_container_width=True)
@@ -9,7 +9,7 @@ import pandas as pd
 import streamlit as st
 
 import _nav
-from db import ALL_SYMBOLS, SYMBOL_NAMES, load_news
+from db import ALL_SYMBOLS, SYMBOL_DISPLAY, SYMBOL_NAMES, load_news
 
 st.set_page_config(page_title="AlphaBoard — 뉴스 피드", page_icon="📰", layout="wide")
 _nav.inject()
@@ -34,7 +34,7 @@ with st.sidebar:
     sym_filter = st.multiselect(
         "종목 필터",
         ALL_SYMBOLS,
-        format_func=lambda s: f"{s} — {SYMBOL_NAMES.get(s, s)}",
+        format_func=lambda s: SYMBOL_DISPLAY.get(s, s),
         label_visibility="collapsed",
     )
     _nav.section("센티먼트")
@@ -48,24 +48,17 @@ with st.sidebar:
     limit = st.slider("최대 기사 수", 20, 200, 60, step=20, label_visibility="collapsed")
     st.divider()
     if st.button("↺  새로고침", use_container_width=True):
-        st.cache_data.clear()
+        # Scoped invalidation — the feed only reads news.
+        load_news.clear()
         st.rerun()
     _nav.status_bar("yfinance · Google News RSS")
 
 st.header("뉴스 피드", divider="blue")
 
 # ── Load news ──────────────────────────────────────────────────────────────────
-if sym_filter:
-    frames = [load_news(s, limit=limit) for s in sym_filter]
-    news_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
-    if not news_df.empty:
-        news_df = (
-            news_df.drop_duplicates(subset=["url"])
-            .sort_values("published", ascending=False, na_position="last")
-            .head(limit)
-        )
-else:
-    news_df = load_news(limit=limit)
+# One IN query for the whole filter — was one round-trip per symbol plus a
+# concat/dedupe/sort pass. Sorted tuple keeps the cache key order-stable.
+news_df = load_news(tuple(sorted(sym_filter)) or None, limit=limit)
 
 if news_df.empty:
     st.info("뉴스 없음. `news_collection` DAG를 실행하세요.")
@@ -81,8 +74,10 @@ if sentiment_filter:
 # ── Header metrics ─────────────────────────────────────────────────────────────
 total      = len(news_df)
 ai_count   = news_df["ai_summary"].notna().sum() if "ai_summary" in news_df.columns else 0
-bullish    = (news_df["sentiment"] == "호재").sum() if "sentiment" in news_df.columns else 0
-bearish    = (news_df["sentiment"] == "악재").sum() if "sentiment" in news_df.columns else 0
+# One value_counts pass instead of an equality scan per sentiment.
+_sent_counts = news_df["sentiment"].value_counts() if "sentiment" in news_df.columns else {}
+bullish    = int(_sent_counts.get("호재", 0))
+bearish    = int(_sent_counts.get("악재", 0))
 
 c1, c2, c3, c4 = st.columns(4)
 c1.metric("총 기사 수", total)
@@ -92,19 +87,48 @@ c4.metric("📉 악재", bearish)
 st.divider()
 
 # ── Group by date ──────────────────────────────────────────────────────────────
-news_df["pub_date"] = pd.to_datetime(news_df["published"]).dt.date
-dates   = sorted(news_df["pub_date"].dropna().unique(), reverse=True)
+# pub_date is parsed/normalized once in load_news, not per rerun.
 undated = news_df[news_df["pub_date"].isna()]
 dated   = news_df[news_df["pub_date"].notna()]
 
-
-def _render_article(row):
-    sym    = row.get("symbol", "")
-    pub    = row["published"].strftime("%H:%M") if pd.notna(row["published"]) else ""
-    source = row.get("source") or ""
-    sentiment = row.get("sentiment") or ""
-    ai_text   = row.get("ai_summary") or ""
-    raw_sum   = row.get("summary") or ""
+# One hash-partition instead of a full boolean scan of `dated` per unique
+# date, and one value_counts table instead of two equality scans per day.
+# value_counts drops NaN sentiments, so a day whose articles all lack one
+# would be missing from the table — reindex over the day keys to keep it.
+_day_groups = {d: g for d, g in dated.groupby("pub_date", sort=False)}
+_day_sent = (
+    dated.groupby("pub_date")["sentiment"].value_counts()
+    .unstack(fill_value=0)
+    .reindex(_day_groups, fill_value=0)
+)
+
+
+def _ai_section_html(section: tuple[str, str, str]) -> str:
+    icon, header, body = section
+    if icon == "📊":
+        # Inline stand-in for the st.info alert this section used to render in.
+        return (
+            f"<b>{header}</b>"
+            f"<div style='background:#1c2733;border-radius:6px;padding:8px 12px;"
+            f"margin:4px 0 10px;color:#c2d9ed'>{body}</div>"
+        )
+    if header:
+        return f"<b>{header}</b><p style='margin:4px 0 10px'>{body}</p>"
+    return f"<p style='margin:4px 0 10px'>{body}</p>"
+
+
+def _article_html(row) -> str:
+    """One article as an HTML block — badges + linked title + collapsible
+    analysis. Returned as a string so a whole day renders in one st.markdown
+    (each st.markdown/expander/divider is its own frontend round-trip)."""
+    sym       = getattr(row, "symbol", "") or ""
+    published = getattr(row, "published", None)
+    pub       = published.strftime("%H:%M") if pd.notna(published) else ""
+    source    = getattr(row, "source", "") or ""
+    sentiment = getattr(row, "sentiment", "") or ""
+    # Pre-split by load_news — render only formats the sections.
+    ai_sections = getattr(row, "ai_sections", None)
+    raw_sum     = getattr(row, "summary", None) or ""
 
     sym_badge = (
         f'<span style="background:#1e3a5f;color:#90caf9;padding:2px 7px;'
@@ -112,60 +136,52 @@ def _render_article(row):
     )
     sent_badge = _sentiment_badge(sentiment) if sentiment else ""
 
-    st.markdown(
-        f"{sym_badge}{sent_badge} **[{row['title']}]({row['url']})**  \n"
+    parts = [
+        '<div style="margin:10px 0">',
+        f'{sym_badge}{sent_badge} <a href="{row.url}" target="_blank" '
+        f'style="font-weight:bold">{row.title}</a><br>',
         f"<span style='color:gray;font-size:0.8em'>{source} &nbsp;·&nbsp; {pub}</span>",
-        unsafe_allow_html=True,
-    )
+    ]
 
-    if ai_text:
-        with st.expander("AI 분석 보기"):
-            # Parse the three sections
-            parts = ai_text.split("\n\n")
-            for part in parts:
-                if part.startswith("📌"):
-                    header, _, body = part.partition("\n")
-                    st.markdown(f"**{header}**")
-                    st.write(body)
-                elif part.startswith("💡"):
-                    header, _, body = part.partition("\n")
-                    st.markdown(f"**{header}**")
-                    st.write(body)
-                elif part.startswith("📊"):
-                    header, _, body = part.partition("\n")
-                    st.markdown(f"**{header}**")
-                    st.info(body)
-                else:
-                    st.write(part)
+    if ai_sections:
+        label, sections = "AI 분석 보기", "".join(_ai_section_html(s) for s in ai_sections)
     elif raw_sum:
-        with st.expander("원문 요약"):
-            st.write(raw_sum)
+        label, sections = "원문 요약", f"<p style='margin:4px 0 10px'>{raw_sum}</p>"
+    else:
+        label = sections = ""
+    if sections:
+        parts.append(
+            '<details style="margin-top:6px">'
+            f'<summary style="cursor:pointer;color:#90caf9;font-size:0.85em">{label}</summary>'
+            f'<div style="padding:8px 4px 0">{sections}</div></details>'
+        )
 
-    st.divider()
+    parts.append('</div><hr style="margin:10px 0;border:none;border-top:1px solid #2e2e3e">')
+    return "\n".join(parts)
 
 
-for date in dates:
-    day_df = dated[dated["pub_date"] == date]
-    if day_df.empty:
-        continue
+for date in sorted(_day_groups, reverse=True):
+    day_df = _day_groups[date]
 
-    # Count sentiments for this day
-    day_bullish = (day_df["sentiment"] == "호재").sum()
-    day_bearish = (day_df["sentiment"] == "악재").sum()
+    # Per-day sentiment counts from the precomputed table
+    day_bullish = int(_day_sent.at[date, "호재"]) if "호재" in _day_sent.columns else 0
+    day_bearish = int(_day_sent.at[date, "악재"]) if "악재" in _day_sent.columns else 0
     sent_summary = ""
     if day_bullish or day_bearish:
         sent_summary = f"&nbsp;&nbsp;<span style='color:#a5d6a7;font-size:0.8em'>호재 {day_bullish}</span>&nbsp;<span style='color:#ef9a9a;font-size:0.8em'>악재 {day_bearish}</span>"
 
+    # One markdown element per day — header plus every article in a single blob.
+    day_html = "\n".join(_article_html(row) for row in day_df.itertuples())
     st.markdown(
-        f"<h4 style='color:#9e9e9e;margin:8px 0'>📅 {date.strftime('%Y년 %m월 %d일')}{sent_summary}</h4>",
+        f"<h4 style='color:#9e9e9e;margin:8px 0'>📅 {date.strftime('%Y년 %m월 %d일')}{sent_summary}</h4>\n"
+        f"{day_html}",
         unsafe_allow_html=True,
     )
 
-    for _, row in day_df.iterrows():
-        _render_article(row)
-
 # ── Undated articles ───────────────────────────────────────────────────────────
 if not undated.empty:
-    st.markdown("<h4 style='color:#9e9e9e'>날짜 미상</h4>", unsafe_allow_html=True)
-    for _, row in undated.iterrows():
-        _render_article(row)
+    undated_html = "\n".join(_article_html(row) for row in undated.itertuples())
+    st.markdown(
+        f"<h4 style='color:#9e9e9e'>날짜 미상</h4>\n{undated_html}",
+        unsafe_allow_html=True,
+    )
@@ -18,10 +18,11 @@ st.caption("매주 월요일 자동 생성 · Claude AI 기반 종합 분석")
 # ── Sidebar ────────────────────────────────────────────────────────────────────
 with st.sidebar:
     _nav.section("표시 설정")
-    show_weeks = st.slider("불러올 주 수", 1, 12, 4, label_visibility="collapsed")
+    show_weeks = st.slider("불러올 주 수", 1, 12, 2, label_visibility="collapsed")
     st.divider()
     if st.button("↺  새로고침", use_container_width=True):
-        st.cache_data.clear()
+        # Scoped invalidation — this page only reads the digests.
+        load_weekly_digests.clear()
         st.rerun()
     st.divider()
     st.markdown("""
@@ -36,6 +37,17 @@ with st.sidebar:
 # ── Load data ──────────────────────────────────────────────────────────────────
 digests = load_weekly_digests(limit=show_weeks)
 
+
+# Digest bodies are long LLM-generated blobs that never change once written —
+# cache the paragraph split per content string so reruns skip re-scanning it,
+# and the frontend can diff unchanged blocks instead of one huge element.
+@st.cache_data(ttl=3600, show_spinner=False)
+def _content_blocks(content: str) -> tuple[str, ...]:
+    if "```" in content:
+        # A blank line inside a code fence would split the fence in two.
+        return (content,)
+    return tuple(b for b in content.split("\n\n") if b.strip())
+
 if digests.empty:
     st.info(
         "아직 생성된 주간 이슈가 없습니다.\n\n"
@@ -53,12 +65,26 @@ if digests.empty:
     st.stop()
 
 # ── Render each week ───────────────────────────────────────────────────────────
-for i, (_, row) in enumerate(digests.iterrows()):
-    week_start = row["week_start"]
-    week_end   = row["week_end"]
-    headline   = row.get("headline") or f"{week_start} ~ {week_end} 주간 이슈"
-    content    = row.get("content") or ""
-    created_at = row.get("created_at")
+# Backfill optional columns so the namedtuple rows below always carry every
+# field — itertuples skips the per-row Series construction of iterrows.
+for c in {"week_start", "week_end", "headline", "content", "created_at"} - set(digests.columns):
+    digests[c] = None
+
+# Missing values arrive as pd.NA (arrow-backed loader), which isn't
+# truthy-testable — guard with notna instead of `or`.
+def _ymd(v) -> str:
+    # The arrow-backed loader hands back midnight Timestamps, whose str()
+    # carries a 00:00:00 tail — format the date part explicitly.
+    if pd.notna(v) and hasattr(v, "strftime"):
+        return v.strftime("%Y-%m-%d")
+    return str(v)
+
+for i, row in enumerate(digests.itertuples(index=False)):
+    week_start = row.week_start
+    week_end   = row.week_end
+    headline   = row.headline if pd.notna(row.headline) else f"{_ymd(week_start)} ~ {_ymd(week_end)} 주간 이슈"
+    content    = row.content if pd.notna(row.content) else ""
+    created_at = row.created_at
 
     # Week header
     if i == 0:
@@ -84,20 +110,23 @@ for i, (_, row) in enumerate(digests.iterrows()):
                 f"{week_end.strftime('%m월 %d일')}"
             )
         else:
-            date_str = f"{week_start} ~ {week_end}"
+            date_str = f"{_ymd(week_start)} ~ {_ymd(week_end)}"
         st.markdown(f"### {date_str}")
 
-    if created_at is not None:
+    if pd.notna(created_at):
         st.caption(f"생성: {pd.Timestamp(created_at).strftime('%Y-%m-%d %H:%M UTC')}")
 
     # Render digest content
     if i == 0:
-        # Latest week: fully expanded
-        st.markdown(content)
+        # Latest week: fully expanded, block by block
+        for b in _content_blocks(content):
+            st.markdown(b)
     else:
-        # Older weeks: inside expander
+        # Older weeks: collapsed expanders still render their body to the
+        # DOM, so gate the long markdown behind an explicit toggle.
         with st.expander(f"📄 {headline}", expanded=False):
-            st.markdown(content)
+            if st.toggle("전체 내용 보기", key=f"wd_show_{week_start}"):
+                st.markdown(content)
 
     st.divider()
 
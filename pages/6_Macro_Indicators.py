@@ -4,12 +4,16 @@ YF: 주요 지수, FX, 원자재, 암호화폐
 FRED: 미국 금리, 장단기 스프레드, M2, 하이일드 스프레드
 """
 
+from typing import NamedTuple
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
 import streamlit as st
 
 import _nav
-from db import MACRO_LABELS, load_macro_data
+from db import MACRO_LABELS, downsample_line, load_macro_data
 
 # ── 시리즈 그룹 정의 ───────────────────────────────────────────────────────────
 
@@ -30,6 +34,72 @@ COLORS = [
 
 TIMEFRAME = {"1M": 30, "3M": 90, "6M": 180, "1Y": 365, "2Y": 730}
 
+
+# 2-year history for the heatmap tab — independent of the sidebar timeframe,
+# so it gets its own longer-lived cache entry instead of re-querying on every
+# slider/toggle rerun.
+@st.cache_data(ttl=3600, show_spinner=False)
+def _macro_full_2y() -> pd.DataFrame:
+    df = load_macro_data(days=730)
+    if df is not None and not df.empty:
+        # Heatmaps/correlations don't need 64-bit — float32 halves the cached
+        # footprint and the bandwidth of every pct_change/corr pass over it.
+        num_cols = df.select_dtypes(include="float").columns
+        df[num_cols] = df[num_cols].astype("float32")
+    return df
+
+# 카테고리 순서 (히트맵 정렬용)
+CAT_ORDER = (
+    ["SP500", "Nasdaq100", "DowJones", "KOSPI", "KOSDAQ", "VIX"] +
+    ["DXY", "USD_KRW", "WTI_Oil", "Gold", "Silver", "Copper"] +
+    ["Bitcoin", "Ethereum"] +
+    ["US10Y", "US2Y", "YieldCurve", "HighYield_Spread", "M2_Supply"]
+)
+
+
+class _HeatmapFrames(NamedTuple):
+    block: pd.DataFrame
+    avail_cat: tuple[str, ...]
+    ret_full: pd.DataFrame
+    corr_full: pd.DataFrame
+    corr_recent: pd.DataFrame
+    corr_delta: pd.DataFrame
+
+
+def _fast_corr(ret: pd.DataFrame) -> pd.DataFrame:
+    """Correlation matrix via one standardize + GEMM when the return block is
+    dense. Sparse blocks (mixed FRED/YF publish days) keep pandas' pairwise
+    NaN handling — shared centering would skew those coefficients."""
+    A = ret.to_numpy(dtype="float64")
+    if np.isnan(A).any():
+        return ret.corr()
+    A = A - A.mean(axis=0)
+    s = A.std(axis=0)
+    # Zero-variance columns go NaN, matching pandas' corr output.
+    A = A / np.where(s > 0, s, np.nan)
+    c = (A.T @ A) / max(len(A), 1)
+    return pd.DataFrame(c, index=ret.columns, columns=ret.columns)
+
+
+# The derived matrices (returns, both correlations, their delta) only change
+# when the 2-year frame does — compute them once per data version so section
+# switches and sidebar reruns unpack a tuple instead of re-running pandas.
+@st.cache_data(ttl=1800, show_spinner=False)
+def _heatmap_frames() -> _HeatmapFrames | None:
+    df_hm = _macro_full_2y()
+    if df_hm is None or df_hm.empty:
+        return None
+    avail_cat = [k for k in CAT_ORDER if k in df_hm.columns]
+    block = df_hm.reindex(columns=avail_cat)
+    ret_full = block.pct_change().dropna(how="all")
+    corr_full   = _fast_corr(ret_full).loc[avail_cat, avail_cat]
+    corr_recent = _fast_corr(ret_full.iloc[-60:]).loc[avail_cat, avail_cat]
+    return _HeatmapFrames(
+        block, tuple(avail_cat), ret_full,
+        corr_full, corr_recent, corr_recent - corr_full,
+    )
+
+
 # ── 페이지 설정 ───────────────────────────────────────────────────────────────
 
 st.set_page_config(
@@ -50,7 +120,10 @@ with st.sidebar:
     normalize = st.checkbox("수익률 정규화 (100 기준)", value=False)
     st.divider()
     if st.button("↺  새로고침", use_container_width=True):
-        st.cache_data.clear()
+        # Scoped invalidation — this page only reads macro series.
+        load_macro_data.clear()
+        _macro_full_2y.clear()
+        _heatmap_frames.clear()
         st.rerun()
     _nav.status_bar("Yahoo Finance · FRED API")
 
@@ -67,49 +140,74 @@ if df is None or df.empty:
 
 # ── KPI 카드 ──────────────────────────────────────────────────────────────────
 
+def _pct_fmt(v) -> str:
+    return f"{v:+.2f}%" if pd.notna(v) else "—"
+
+
+# Column-wise CSS for Styler.apply — one np.where pass per column instead of
+# Styler.map's per-cell Python dispatch. NaN compares False on both branches
+# and keeps the old unstyled fallthrough via > 0.
+def _col_color(col: pd.Series) -> np.ndarray:
+    v = col.to_numpy(dtype="float64")
+    return np.where(np.isnan(v), "",
+                    np.where(v > 0, "color: #26a69a", "color: #ef5350"))
+
+
+def _kpi_fmt(v: float) -> str:
+    # 값 포맷 (큰 수는 쉼표, 소수는 2자리)
+    if abs(v) >= 10000:
+        return f"{v:,.0f}"
+    if abs(v) >= 100:
+        return f"{v:,.2f}"
+    return f"{v:.4f}"
+
+
+# One ffill+tail pass over the KPI block — the per-key loop below only reads
+# scalars, instead of six dropna() scans of full columns.
+_present  = [k for k in KPI_SERIES if k in df.columns]
+_kpi_tail = df[_present].ffill().tail(2)
+_kpi_last = _kpi_tail.iloc[-1] if len(_kpi_tail) else pd.Series(dtype="float64")
+_kpi_prev = _kpi_tail.iloc[-2] if len(_kpi_tail) >= 2 else _kpi_last
+_kpi_pct  = ((_kpi_last - _kpi_prev) / _kpi_prev.where(_kpi_prev != 0) * 100).fillna(0)
+
 kpi_cols = st.columns(len(KPI_SERIES))
 for col, key in zip(kpi_cols, KPI_SERIES):
-    if key not in df.columns:
-        col.metric(MACRO_LABELS.get(key, key), "—")
-        continue
-    series = df[key].dropna()
-    if series.empty:
+    latest = _kpi_last.get(key)
+    if latest is None or pd.isna(latest):
         col.metric(MACRO_LABELS.get(key, key), "—")
         continue
-    latest = series.iloc[-1]
-    prev   = series.iloc[-2] if len(series) >= 2 else latest
-    delta  = latest - prev
-    delta_pct = delta / prev * 100 if prev else 0
-
-    # 값 포맷 (큰 수는 쉼표, 소수는 2자리)
-    if abs(latest) >= 10000:
-        val_str = f"{latest:,.0f}"
-    elif abs(latest) >= 100:
-        val_str = f"{latest:,.2f}"
-    else:
-        val_str = f"{latest:.4f}"
 
     col.metric(
         label=MACRO_LABELS.get(key, key),
-        value=val_str,
-        delta=f"{delta_pct:+.2f}%",
+        value=_kpi_fmt(latest),
+        delta=f"{_kpi_pct[key]:+.2f}%",
         delta_color="normal" if key != "VIX" else "inverse",
     )
 
 st.divider()
 
-# ── 탭별 차트 ─────────────────────────────────────────────────────────────────
+# ── 섹션별 차트 ───────────────────────────────────────────────────────────────
 
-tabs = st.tabs(list(GROUPS.keys()) + ["🗓️ 히트맵"])
-
-for tab, (group_name, keys) in zip(tabs[:-1], GROUPS.items()):
-    with tab:
-        # 현재 기간에 존재하는 시리즈만 필터
-        avail = [k for k in keys if k in df.columns and df[k].dropna().shape[0] > 1]
-        if not avail:
-            st.info("이 기간에 데이터가 없습니다.")
-            continue
+# st.tabs runs every tab's body on every rerun — figures and styled tables
+# for sections nobody is looking at. A radio branch builds only the active
+# one, at the cost of losing the tab styling.
+view = st.radio(
+    "섹션", list(GROUPS.keys()) + ["🗓️ 히트맵"],
+    horizontal=True, label_visibility="collapsed",
+)
 
+# One count() pass over every grouped column — each section used to dropna()
+# per column just to count it.
+_all_keys   = [k for ks in GROUPS.values() for k in ks if k in df.columns]
+_col_counts = df[_all_keys].count()
+
+if view in GROUPS:
+    keys = GROUPS[view]
+    # 현재 기간에 존재하는 시리즈만 필터
+    avail = [k for k in keys if _col_counts.get(k, 0) > 1]
+    if not avail:
+        st.info("이 기간에 데이터가 없습니다.")
+    else:
         # ── 라인 차트 ────────────────────────────────────────────────────────
         fig = go.Figure()
         use_secondary = False
@@ -133,9 +231,13 @@ for tab, (group_name, keys) in zip(tabs[:-1], GROUPS.items()):
             if on_secondary:
                 use_secondary = True
 
-            fig.add_trace(go.Scatter(
-                x=series.index,
-                y=y,
+            # 2Y daily series run to ~730 points per trace — LTTB keeps the
+            # shape at ~400 and shorter windows pass through untouched.
+            x_ds, y_ds = downsample_line(series.index, y, n_out=400)
+            # WebGL traces — SVG Scatter builds one DOM node per point.
+            fig.add_trace(go.Scattergl(
+                x=x_ds,
+                y=y_ds,
                 name=MACRO_LABELS.get(key, key),
                 line=dict(color=color, width=2),
                 yaxis="y2" if on_secondary else "y",
@@ -168,123 +270,168 @@ for tab, (group_name, keys) in zip(tabs[:-1], GROUPS.items()):
         st.plotly_chart(fig, use_container_width=True)
 
         # ── 최신값 + 변화율 테이블 ────────────────────────────────────────────
-        records = []
-        for key in avail:
-            series = df[key].dropna()
-            latest = series.iloc[-1]
-            prev_1d = series.iloc[-2]       if len(series) >= 2  else None
-            prev_1w = series.iloc[-6]       if len(series) >= 6  else None
-            prev_1m = series.iloc[-22]      if len(series) >= 22 else None
-            prev_3m = series.iloc[-66]      if len(series) >= 66 else None
-
-            def _chg(prev):
-                if prev is None or prev == 0:
-                    return None
-                return (latest - prev) / abs(prev) * 100
-
-            if abs(latest) >= 10000:
-                val_str = f"{latest:,.0f}"
-            elif abs(latest) >= 100:
-                val_str = f"{latest:,.2f}"
+        # One shifted diff per lag over the whole column block — was four
+        # iloc scalar reads plus a closure per series. abs(prev) keeps the
+        # sign convention for series that can go negative (YieldCurve).
+        sub = df[avail].ffill()
+        latest_row = sub.iloc[-1]
+        chg = {}
+        for k, name in ((1, "1일(%)"), (5, "1주(%)"), (21, "1개월(%)"), (65, "3개월(%)")):
+            if len(sub) > k:
+                prev = sub.iloc[-1 - k]
+                chg[name] = (latest_row - prev) / prev.abs().where(prev != 0) * 100
             else:
-                val_str = f"{latest:.4f}"
+                chg[name] = pd.Series(index=sub.columns, dtype="float64")
 
-            records.append({
+        records = [
+            {
                 "지표":     MACRO_LABELS.get(key, key),
-                "최신값":    val_str,
-                "1일(%)":   _chg(prev_1d),
-                "1주(%)":   _chg(prev_1w),
-                "1개월(%)": _chg(prev_1m),
-                "3개월(%)": _chg(prev_3m),
-            })
+                "최신값":    _kpi_fmt(latest_row[key]),
+                "1일(%)":   chg["1일(%)"][key],
+                "1주(%)":   chg["1주(%)"][key],
+                "1개월(%)": chg["1개월(%)"][key],
+                "3개월(%)": chg["3개월(%)"][key],
+            }
+            for key in avail
+        ]
 
         tbl = pd.DataFrame(records)
 
-        def _pct_color(v):
-            if pd.isna(v): return ""
-            return "color: #26a69a" if v > 0 else "color: #ef5350"
-
         styled = (
             tbl.style
-            .map(_pct_color, subset=["1일(%)", "1주(%)", "1개월(%)", "3개월(%)"])
-            .format({
-                "1일(%)":   lambda v: f"{v:+.2f}%" if pd.notna(v) else "—",
-                "1주(%)":   lambda v: f"{v:+.2f}%" if pd.notna(v) else "—",
-                "1개월(%)": lambda v: f"{v:+.2f}%" if pd.notna(v) else "—",
-                "3개월(%)": lambda v: f"{v:+.2f}%" if pd.notna(v) else "—",
-            })
+            .apply(_col_color, subset=["1일(%)", "1주(%)", "1개월(%)", "3개월(%)"])
+            .format({c: _pct_fmt for c in ("1일(%)", "1주(%)", "1개월(%)", "3개월(%)")})
             .set_properties(**{"text-align": "right"})
             .set_properties(subset=["지표", "최신값"], **{"text-align": "left"})
         )
         st.dataframe(styled, use_container_width=True, hide_index=True)
 
-# ── 히트맵 탭 ─────────────────────────────────────────────────────────────────
+# ── 히트맵 섹션 ───────────────────────────────────────────────────────────────
+
+
+# The heatmap figures only change when the 2-year frame does — memoize them
+# as JSON under a cheap shape+last-date fingerprint (same pattern as the
+# price-chart builders) so slider/toggle reruns rehydrate instead of
+# recomputing the lookback/monthly pipelines.
+_HM_FP = {pd.DataFrame: lambda d: (d.shape, str(d.index[-1]) if len(d) else "")}
+
+
+@st.cache_data(ttl=1800, hash_funcs=_HM_FP)
+def _build_scorecard_fig(block: pd.DataFrame, avail_cat: tuple[str, ...]) -> str:
+    LOOKBACKS = {"1일": 1, "1주": 7, "1개월": 30, "3개월": 91, "6개월": 182, "1년": 365}
+    # One (lookbacks × series) gather off the ffilled matrix — the old
+    # double loop ran a dropna + two iloc reads per cell.
+    vals    = block.ffill().to_numpy(dtype="float64")
+    n_rows  = len(vals)
+    latest  = vals[-1]
+    offsets = np.array(list(LOOKBACKS.values()))
+    prev    = vals[np.clip(n_rows - 1 - offsets, 0, None), :]        # (6, K)
+    valid   = (offsets[:, None] < n_rows) & (prev != 0) & ~np.isnan(prev)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(valid, (latest[None, :] - prev) / np.abs(prev) * 100, np.nan)
+
+    # All-NaN series drop out, same as the old per-key emptiness skip.
+    keep    = ~np.isnan(vals).all(axis=0)
+    pct     = pct[:, keep].T                                          # (K', 6)
+    sc_y    = [MACRO_LABELS.get(k, k) for k, m in zip(avail_cat, keep) if m]
+    sc_text = np.where(np.isnan(pct), "—",
+                       np.char.add(np.char.mod("%+.1f", pct), "%"))
+
+    fig_sc = go.Figure(go.Heatmap(
+        z=pct,
+        x=list(LOOKBACKS.keys()),
+        y=sc_y,
+        colorscale="RdYlGn",
+        zmid=0,
+        text=sc_text,
+        texttemplate="%{text}",
+        textfont={"size": 11},
+        hoverongaps=False,
+        colorbar=dict(title="수익률(%)", thickness=14),
+    ))
+    fig_sc.update_layout(
+        height=max(380, len(sc_y) * 30 + 60),
+        template="plotly_dark",
+        plot_bgcolor="#0e1117",
+        paper_bgcolor="#0e1117",
+        margin=dict(l=10, r=10, t=10, b=10),
+        xaxis=dict(showgrid=False, side="top"),
+        yaxis=dict(showgrid=False, autorange="reversed"),
+    )
+    return fig_sc.to_json()
+
+
+@st.cache_data(ttl=1800, hash_funcs=_HM_FP)
+def _build_monthly_fig(block: pd.DataFrame) -> str:
+    # Period-key groupby skips the date-offset machinery resample("ME")
+    # runs through for the same month buckets.
+    monthly     = block.groupby(block.index.to_period("M")).last()
+    monthly_ret = (monthly.pct_change() * 100).iloc[1:]
+    valid_cols  = [c for c in monthly_ret.columns if monthly_ret[c].notna().sum() >= 3]
+    monthly_ret = monthly_ret[valid_cols]
+
+    # Broadcasted (x - mu) / sd over the whole block — apply re-invoked a
+    # Python lambda (and recomputed std) per column. Zero/undefined-std
+    # columns divide by inf → 0, matching the old col*0 branch, while NaN
+    # cells stay NaN so the heatmap keeps its gaps.
+    _sd = monthly_ret.std()
+    monthly_z = (monthly_ret - monthly_ret.mean()) / _sd.where(_sd > 0, np.inf)
+
+    zm_y  = [MACRO_LABELS.get(c, c) for c in monthly_z.columns]
+    # Year/month come out of the index as arrays — per-timestamp strftime
+    # is pure Python-level overhead for a fixed "yy/mm" label.
+    zm_x  = [f"{y % 100:02d}/{m:02d}"
+             for y, m in zip(monthly_z.index.year, monthly_z.index.month)]
+    # One np.char pass over the whole grid — the nested comprehension
+    # formatted cell by cell in Python.
+    _ret_arr = monthly_ret.to_numpy().T
+    text_z = np.where(
+        np.isnan(_ret_arr), "",
+        np.char.add(np.char.mod("%+.1f", _ret_arr), "%"),
+    )
 
-# 카테고리 순서 (히트맵 정렬용)
-CAT_ORDER = (
-    ["SP500", "Nasdaq100", "DowJones", "KOSPI", "KOSDAQ", "VIX"] +
-    ["DXY", "USD_KRW", "WTI_Oil", "Gold", "Silver", "Copper"] +
-    ["Bitcoin", "Ethereum"] +
-    ["US10Y", "US2Y", "YieldCurve", "HighYield_Spread", "M2_Supply"]
-)
+    fig_z = go.Figure(go.Heatmap(
+        z=monthly_z.T.to_numpy(),
+        x=zm_x,
+        y=zm_y,
+        colorscale="RdYlGn",
+        zmid=0, zmin=-3, zmax=3,
+        text=text_z,
+        texttemplate="%{text}",
+        textfont={"size": 10},
+        hoverongaps=False,
+        colorbar=dict(title="z-score", thickness=16, len=0.95),
+    ))
+    fig_z.update_layout(
+        height=len(zm_y) * 38 + 80,
+        template="plotly_dark",
+        plot_bgcolor="#0e1117",
+        paper_bgcolor="#0e1117",
+        margin=dict(l=10, r=10, t=10, b=60),
+        xaxis=dict(showgrid=False, tickangle=-45, tickfont=dict(size=11)),
+        yaxis=dict(showgrid=False, tickfont=dict(size=12)),
+    )
+    return fig_z.to_json()
 
-with tabs[-1]:
-    import numpy as np
 
-    df_hm = load_macro_data(days=730)
+if view == "🗓️ 히트맵":
+    hm = _heatmap_frames()
 
-    if df_hm is None or df_hm.empty:
+    if hm is None:
         st.info("데이터 없음.")
     else:
-        avail_cat = [k for k in CAT_ORDER if k in df_hm.columns]
+        block, avail_cat = hm.block, list(hm.avail_cat)
+        # One label resolution reused by every heatmap below.
+        labels_by_key = {k: MACRO_LABELS.get(k, k) for k in avail_cat}
 
         # ── 1. 기간별 성과 스코어카드 ─────────────────────────────────────────
         st.subheader("📋 기간별 성과 스코어카드")
         st.caption("각 지표의 현재 기준 기간별 수익률 — 무엇이 지금 강한지 한눈에")
 
-        LOOKBACKS = {"1일": 1, "1주": 7, "1개월": 30, "3개월": 91, "6개월": 182, "1년": 365}
-        sc_rows, sc_text = [], []
-        for key in avail_cat:
-            s = df_hm[key].dropna()
-            if s.empty:
-                continue
-            latest = s.iloc[-1]
-            row, txt = [], []
-            for n in LOOKBACKS.values():
-                if len(s) > n:
-                    prev = s.iloc[-(n + 1)]
-                    pct  = (latest - prev) / abs(prev) * 100 if prev else None
-                else:
-                    pct = None
-                row.append(pct)
-                txt.append(f"{pct:+.1f}%" if pct is not None else "—")
-            sc_rows.append(row)
-            sc_text.append(txt)
-
-        sc_y = [MACRO_LABELS.get(k, k) for k in avail_cat if k in df_hm.columns and not df_hm[k].dropna().empty]
-
-        fig_sc = go.Figure(go.Heatmap(
-            z=sc_rows,
-            x=list(LOOKBACKS.keys()),
-            y=sc_y,
-            colorscale="RdYlGn",
-            zmid=0,
-            text=sc_text,
-            texttemplate="%{text}",
-            textfont={"size": 11},
-            hoverongaps=False,
-            colorbar=dict(title="수익률(%)", thickness=14),
-        ))
-        fig_sc.update_layout(
-            height=max(380, len(sc_y) * 30 + 60),
-            template="plotly_dark",
-            plot_bgcolor="#0e1117",
-            paper_bgcolor="#0e1117",
-            margin=dict(l=10, r=10, t=10, b=10),
-            xaxis=dict(showgrid=False, side="top"),
-            yaxis=dict(showgrid=False, autorange="reversed"),
+        st.plotly_chart(
+            pio.from_json(_build_scorecard_fig(block, tuple(avail_cat))),
+            use_container_width=True,
         )
-        st.plotly_chart(fig_sc, use_container_width=True)
 
         st.divider()
 
@@ -292,57 +439,19 @@ with tabs[-1]:
         st.subheader("📅 월별 수익률")
         st.caption("행 z-score 정규화 — 각 지표의 자기 변동성 대비 얼마나 이상한 달이었나 · 셀 내 텍스트는 실제 수익률(%)")
 
-        monthly     = df_hm[avail_cat].resample("ME").last()
-        monthly_ret = (monthly.pct_change() * 100).iloc[1:]
-        valid_cols  = [c for c in monthly_ret.columns if monthly_ret[c].notna().sum() >= 3]
-        monthly_ret = monthly_ret[valid_cols]
-
-        monthly_z = monthly_ret.apply(
-            lambda col: (col - col.mean()) / col.std() if col.std() > 0 else col * 0
-        )
-
-        zm_y  = [MACRO_LABELS.get(c, c) for c in monthly_z.columns]
-        zm_x  = [d.strftime("%y/%m") for d in monthly_z.index]
-        text_z = [
-            [f"{monthly_ret[c].iloc[j]:+.1f}%" if pd.notna(monthly_ret[c].iloc[j]) else ""
-             for j in range(len(monthly_z))]
-            for c in valid_cols
-        ]
-
-        fig_z = go.Figure(go.Heatmap(
-            z=monthly_z.T.values.tolist(),
-            x=zm_x,
-            y=zm_y,
-            colorscale="RdYlGn",
-            zmid=0, zmin=-3, zmax=3,
-            text=text_z,
-            texttemplate="%{text}",
-            textfont={"size": 10},
-            hoverongaps=False,
-            colorbar=dict(title="z-score", thickness=16, len=0.95),
-        ))
-        fig_z.update_layout(
-            height=len(zm_y) * 38 + 80,
-            template="plotly_dark",
-            plot_bgcolor="#0e1117",
-            paper_bgcolor="#0e1117",
-            margin=dict(l=10, r=10, t=10, b=60),
-            xaxis=dict(showgrid=False, tickangle=-45, tickfont=dict(size=11)),
-            yaxis=dict(showgrid=False, tickfont=dict(size=12)),
+        st.plotly_chart(
+            pio.from_json(_build_monthly_fig(block)),
+            use_container_width=True,
         )
-        st.plotly_chart(fig_z, use_container_width=True)
 
         st.divider()
 
         # ── 3. 상관관계 분석 ───────────────────────────────────────────────────
         st.subheader("🔗 상관관계 분석")
 
-        ret_full   = df_hm[avail_cat].pct_change().dropna(how="all")
-        ret_recent = ret_full.iloc[-60:]   # 최근 60일 (약 2개월)
-        corr_full   = ret_full.corr().loc[avail_cat, avail_cat]
-        corr_recent = ret_recent.corr().loc[avail_cat, avail_cat]
-        corr_delta  = corr_recent - corr_full
-        c_labels    = [MACRO_LABELS.get(c, c) for c in avail_cat]
+        ret_full, corr_full = hm.ret_full, hm.corr_full
+        corr_recent, corr_delta = hm.corr_recent, hm.corr_delta
+        c_labels = [labels_by_key[c] for c in avail_cat]
 
         def _safe_corr(mat, k1, k2):
             try:
@@ -354,13 +463,12 @@ with tabs[-1]:
         st.markdown("**① 전체 기간 상관관계** (2년 일간 수익률 기준 · |r|≥0.5만 수치 표시)")
         st.caption("빨강=양의 상관(같이 움직임) · 파랑=음의 상관(반대로 움직임)")
 
-        text_full = [
-            [f"{corr_full.iloc[i,j]:.2f}" if abs(corr_full.iloc[i,j]) >= 0.5 else ""
-             for j in range(len(avail_cat))]
-            for i in range(len(avail_cat))
-        ]
+        # NaN cells fall through the threshold to "" — same as the old
+        # per-cell abs() check.
+        _cf = corr_full.to_numpy()
+        text_full = np.where(np.abs(_cf) >= 0.5, np.char.mod("%.2f", _cf), "")
         fig_full = go.Figure(go.Heatmap(
-            z=corr_full.values.tolist(), x=c_labels, y=c_labels,
+            z=_cf, x=c_labels, y=c_labels,
             colorscale="RdBu_r", zmin=-1, zmax=1,
             text=text_full, texttemplate="%{text}", textfont={"size": 10},
             hoverongaps=False, colorbar=dict(title="r", thickness=16),
@@ -398,13 +506,10 @@ with tabs[-1]:
         st.markdown("**② 상관관계 변화 (최근 60일 − 전체 기간)**")
         st.caption("🔴 빨강: 최근 동조화 강해짐 → 분산 효과 약화, 시장 전체가 같은 방향  |  🔵 파랑: 최근 분산 효과 커짐 → 헤지 관계 강화  |  |Δr|≥0.15만 수치 표시")
 
-        text_delta = [
-            [f"{corr_delta.iloc[i,j]:+.2f}" if abs(corr_delta.iloc[i,j]) >= 0.15 else ""
-             for j in range(len(avail_cat))]
-            for i in range(len(avail_cat))
-        ]
+        _cd = corr_delta.to_numpy()
+        text_delta = np.where(np.abs(_cd) >= 0.15, np.char.mod("%+.2f", _cd), "")
         fig_delta = go.Figure(go.Heatmap(
-            z=corr_delta.values.tolist(), x=c_labels, y=c_labels,
+            z=_cd, x=c_labels, y=c_labels,
             colorscale="RdBu_r", zmid=0, zmin=-0.6, zmax=0.6,
             text=text_delta, texttemplate="%{text}", textfont={"size": 10},
             hoverongaps=False, colorbar=dict(title="Δr", thickness=16),
@@ -465,9 +570,10 @@ with tabs[-1]:
             rc = ret_full[k1].rolling(60).corr(ret_full[k2]).dropna()
             if rc.empty:
                 continue
+            x_ds, y_ds = downsample_line(rc.index, rc.to_numpy(), n_out=400)
             # 현재값 강조 마커
-            fig_roll.add_trace(go.Scatter(
-                x=rc.index, y=rc.values, name=label,
+            fig_roll.add_trace(go.Scattergl(
+                x=x_ds, y=y_ds, name=label,
                 line=dict(color=color, width=2),
                 hovertemplate=f"{label}: %{{y:.2f}}<extra></extra>",
             ))
@@ -597,17 +703,17 @@ with tabs[-1]:
                     f"미국10년물↔S&P500 상관계수 **{r_sp:.2f}** — 금리와 주식이 같이 상승. "
                     "경기 기대감이 인플레 우려를 상쇄하는 구간."))
 
-        # 가장 큰 상관관계 변화 포착
-        big = []
-        for i, k1 in enumerate(avail_cat):
-            for j, k2 in enumerate(avail_cat):
-                if j <= i:
-                    continue
-                d = corr_delta.iloc[i, j]
-                if abs(d) >= 0.25:
-                    big.append((abs(d), d, MACRO_LABELS.get(k1, k1), MACRO_LABELS.get(k2, k2)))
-        big.sort(reverse=True)
-        for _, d, l1, l2 in big[:2]:
+        # 가장 큰 상관관계 변화 포착 — one triu gather over the matrix instead
+        # of a K² Python loop with per-cell iloc; NaN deltas fail the
+        # threshold exactly like the old abs() check.
+        _M = corr_delta.to_numpy()
+        _iu, _ju = np.triu_indices_from(_M, k=1)
+        _d = _M[_iu, _ju]
+        _hit = np.abs(_d) >= 0.25
+        _d, _iu, _ju = _d[_hit], _iu[_hit], _ju[_hit]
+        for t in np.argsort(-np.abs(_d), kind="stable")[:2]:
+            d = _d[t]
+            l1, l2 = labels_by_key[avail_cat[_iu[t]]], labels_by_key[avail_cat[_ju[t]]]
             direction = "급격히 높아짐 (동조화 강화)" if d > 0 else "급격히 낮아짐 (분산 효과 강화)"
             insights.append((f"⚡ 상관관계 급변: {l1}↔{l2}",
                 f"장기 대비 최근 60일 상관계수 **{d:+.2f}** — {direction}."))